@@ -0,0 +1,139 @@
+from pathlib import Path
+
+import numpy as np
+
+from armazenamento import carregar_concursos, contar_concursos, maior_concurso
+from coocorrencia import IndiceCoocorrencia
+from matriz_sorteios import TOTAL_DEZENAS, como_matriz
+from padroes_ocultos import COLUNAS_COLUNAS, COLUNAS_FAIXAS, COLUNAS_LINHAS, extrair_caracteristicas
+
+CAMINHO_ACUMULADORES = Path(__file__).with_name("quina_acumuladores.npz")
+
+class AcumuladorEstatisticas:
+    """Estatísticas do histórico mantidas incrementalmente, sorteio a sorteio.
+
+    Guarda apenas contagens e somas (frequência, histograma de saltos, somas de linhas e
+    colunas, histogramas de faixas e sequências, co-ocorrências), de modo que `adicionar`
+    e `remover` custam O(1) por sorteio e `resumo()` equivale a `estatisticas_agregadas`
+    sem reler o histórico.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.ultimo_concurso = 0
+        self.frequencia = np.zeros(TOTAL_DEZENAS, dtype=np.int64)
+        self.saltos = np.zeros(TOTAL_DEZENAS, dtype=np.int64)
+        self.linhas = np.zeros(len(COLUNAS_LINHAS), dtype=np.int64)
+        self.colunas = np.zeros(len(COLUNAS_COLUNAS), dtype=np.int64)
+        self.faixas = np.zeros((len(COLUNAS_FAIXAS), 6), dtype=np.int64)
+        self.sequencias = np.zeros(5, dtype=np.int64)
+        self.soma_total = 0
+        self.amplitude_total = 0
+        self.coocorrencia = IndiceCoocorrencia()
+
+    def _atualizar(self, dados, sinal):
+        # Listas e arrays não trazem o número do concurso (como_matriz os numera 1..N)
+        numerados = not isinstance(dados, (list, tuple, np.ndarray))
+        matriz = como_matriz(dados if numerados else np.atleast_2d(dados))
+        if not len(matriz):
+            return
+        c = extrair_caracteristicas(matriz.dezenas)
+
+        self.total += sinal * len(matriz)
+        self.frequencia += sinal * matriz.frequencia()
+        self.saltos += sinal * np.bincount(c['distancias'].ravel(), minlength=TOTAL_DEZENAS)
+        self.linhas += sinal * np.array([c[nome].sum() for nome in COLUNAS_LINHAS])
+        self.colunas += sinal * np.array([c[nome].sum() for nome in COLUNAS_COLUNAS])
+        for i, nome in enumerate(COLUNAS_FAIXAS):
+            self.faixas[i] += sinal * np.bincount(c[nome], minlength=6)
+        self.sequencias += sinal * np.bincount(c['sequencias'], minlength=5)
+        self.soma_total += sinal * int(matriz.dezenas.astype(np.int64).sum())
+        self.amplitude_total += sinal * int(c['amplitude'].sum())
+        if sinal > 0:
+            self.coocorrencia.adicionar(matriz.dezenas)
+            if numerados:
+                self.ultimo_concurso = max(self.ultimo_concurso, int(matriz.concursos.max()))
+        else:
+            self.coocorrencia.remover(matriz.dezenas)
+            if not self.total:
+                self.ultimo_concurso = 0
+            elif numerados and self.ultimo_concurso in matriz.concursos:
+                # Saíram os mais recentes: supõe histórico contínuo. Se não for, o pior caso é
+                # `sincronizar_acumuladores` reler concursos, nunca pular algum
+                self.ultimo_concurso = int(matriz.concursos.min()) - 1
+
+    def adicionar(self, dados):
+        """Inclui um sorteio (5 dezenas), um lote N×5, DataFrame ou MatrizSorteios.
+
+        Só DataFrames e MatrizSorteios têm número de concurso: apenas eles atualizam
+        `ultimo_concurso`, usado por `sincronizar_acumuladores`.
+        """
+        self._atualizar(dados, 1)
+
+    def remover(self, dados):
+        """Desfaz `adicionar` (ex.: para deslizar uma janela de concursos)."""
+        self._atualizar(dados, -1)
+
+    def frequencia_global(self):
+        """Mesmo formato de `analise_cartao.calcular_frequencia_global`."""
+        return {dezena: int(qtd) for dezena, qtd in enumerate(self.frequencia, 1) if qtd}
+
+    def saltos_globais(self):
+        """Mesmo formato de `analise_cartao.analisar_saltos`."""
+        return {salto: int(qtd) for salto, qtd in enumerate(self.saltos) if qtd}
+
+    def resumo(self):
+        """Mesmas chaves de `estatisticas_agregadas`, calculadas a partir das contagens."""
+        if not self.total:
+            return {}
+        resumo = {}
+        valores = np.arange(self.faixas.shape[1])
+        for nome, histograma in zip(COLUNAS_FAIXAS, self.faixas):
+            resumo[nome + '_média'] = (histograma * valores).sum() / self.total
+            resumo[nome + '_mais_comum'] = int(np.argmax(histograma))
+        resumo['média_geral'] = self.soma_total / 5 / self.total
+        resumo['amplitude_média'] = self.amplitude_total / self.total
+        resumo['sequências_média'] = (self.sequencias * np.arange(5)).sum() / self.total
+        resumo['sequências_max'] = int(np.flatnonzero(self.sequencias).max())
+        resumo['linha_mais_frequente'] = COLUNAS_LINHAS[int(np.argmax(self.linhas))]
+        resumo['coluna_mais_frequente'] = COLUNAS_COLUNAS[int(np.argmax(self.colunas))]
+        return resumo
+
+    def salvar(self, caminho=CAMINHO_ACUMULADORES):
+        np.savez_compressed(
+            caminho,
+            escalares=np.array([self.total, self.ultimo_concurso, self.soma_total, self.amplitude_total]),
+            frequencia=self.frequencia, saltos=self.saltos, linhas=self.linhas, colunas=self.colunas,
+            faixas=self.faixas, sequencias=self.sequencias, pares=self.coocorrencia.pares,
+            trincas=self.coocorrencia.contagens[3], pares_rank=self.coocorrencia.contagens[2],
+        )
+
+    @classmethod
+    def carregar(cls, caminho=CAMINHO_ACUMULADORES):
+        acumulador = cls()
+        with np.load(caminho) as dados:
+            (acumulador.total, acumulador.ultimo_concurso,
+             acumulador.soma_total, acumulador.amplitude_total) = (int(v) for v in dados['escalares'])
+            for nome in ('frequencia', 'saltos', 'linhas', 'colunas', 'faixas', 'sequencias'):
+                setattr(acumulador, nome, dados[nome])
+            acumulador.coocorrencia.pares = dados['pares']
+            acumulador.coocorrencia.contagens[2] = dados['pares_rank']
+            acumulador.coocorrencia.contagens[3] = dados['trincas']
+            acumulador.coocorrencia.total_sorteios = acumulador.total
+        return acumulador
+
+def sincronizar_acumuladores(conexao, caminho=CAMINHO_ACUMULADORES):
+    """Atualiza os acumuladores salvos com os concursos do banco ainda não incluídos.
+
+    Só lê os concursos novos; se o banco ganhou concursos antigos (lacunas preenchidas),
+    os acumuladores são refeitos do zero.
+    """
+    caminho = Path(caminho)
+    acumulador = AcumuladorEstatisticas.carregar(caminho) if caminho.exists() else AcumuladorEstatisticas()
+    if contar_concursos(conexao, ate=acumulador.ultimo_concurso) != acumulador.total:
+        acumulador = AcumuladorEstatisticas()
+
+    if maior_concurso(conexao) > acumulador.ultimo_concurso:
+        acumulador.adicionar(carregar_concursos(conexao, apos=acumulador.ultimo_concurso))
+        acumulador.salvar(caminho)
+    return acumulador
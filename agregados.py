@@ -1,3 +1,6 @@
+from instrumentacao import instrumentado
+
+@instrumentado()
 def estatisticas_agregadas(df):
     resumo = {}
 
@@ -22,6 +25,3 @@ def estatisticas_agregadas(df):
     resumo['coluna_mais_frequente'] = coluna_soma.idxmax()
 
     return resumo
-
-resumo_padroes = estatisticas_agregadas(df_padroes)
-print("Resumo dos padrões ocultos:", resumo_padroes)
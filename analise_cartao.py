@@ -1,29 +1,38 @@
 from collections import Counter
 from itertools import combinations
 
+import numpy as np
+import pandas as pd
+
+from combinatoria import ranquear, total_combinacoes
+from coocorrencia import POSICOES_COMBINACOES, IndiceCoocorrencia
+from instrumentacao import instrumentado
+from matriz_sorteios import TOTAL_DEZENAS, como_matriz
+from padroes_ocultos import contar_por_classe
+
 def calcular_frequencia_global(df):
     """Calcula a frequência absoluta de cada dezena."""
-    todas_dezenas = [dezena for lista in df['dezenas'] for dezena in lista]
-    frequencia = Counter(todas_dezenas)
-    freq_ordenada = dict(sorted(frequencia.items()))
-    return freq_ordenada
+    frequencia = como_matriz(df).frequencia()
+    return {dezena: int(qtd) for dezena, qtd in enumerate(frequencia, 1) if qtd}
 
 def combinacoes_mais_comuns(df, tamanho=2, top=10):
     """Encontra as combinações (pares ou trincas) mais comuns."""
+    if tamanho in (2, 3, 4):
+        indice = IndiceCoocorrencia.de_sorteios(df, incluir_quadras=tamanho == 4)
+        return indice.mais_comuns(tamanho, top)
+
     todas = []
     for dezenas in df['dezenas']:
         todas.extend(combinations(sorted(dezenas), tamanho))
     contagem = Counter(todas)
     return contagem.most_common(top)
 
+@instrumentado()
 def analisar_saltos(df):
     """Analisa os saltos (diferença entre dezenas consecutivas)."""
-    saltos = []
-    for dezenas in df['dezenas']:
-        dezenas_ordenadas = sorted(dezenas)
-        saltos.extend([b - a for a, b in zip(dezenas_ordenadas, dezenas_ordenadas[1:])])
-    contagem_saltos = Counter(saltos)
-    return dict(sorted(contagem_saltos.items()))
+    saltos = np.diff(como_matriz(df).dezenas.astype(np.int16), axis=1)
+    contagem_saltos = np.bincount(saltos.ravel())
+    return {salto: int(qtd) for salto, qtd in enumerate(contagem_saltos) if qtd}
 
 def analisar_cartao(cartao, frequencia_global, saltos_frequentes, pares_comuns, trincas_comuns):
     """Analisa um cartão individual baseado em estatísticas históricas."""
@@ -48,11 +57,11 @@ def analisar_cartao(cartao, frequencia_global, saltos_frequentes, pares_comuns,
     saltos = [b - a for a, b in zip(cartao, cartao[1:])]
 
     # Pares e trincas reconhecidas
-    pares_do_cartao = list(combinations(cartao, 2))
-    trincas_do_cartao = list(combinations(cartao, 3))
+    pares_do_cartao = set(combinations(cartao, 2))
+    trincas_do_cartao = set(combinations(cartao, 3))
 
-    pares_encontrados = [p for p in pares_comuns if p[0] in pares_do_cartao]
-    trincas_encontradas = [t for t in trincas_comuns if t[0] in trincas_do_cartao]
+    pares_encontrados = [p for p in pares_comuns if tuple(p[0]) in pares_do_cartao]
+    trincas_encontradas = [t for t in trincas_comuns if tuple(t[0]) in trincas_do_cartao]
 
     return {
         'soma': soma,
@@ -65,3 +74,49 @@ def analisar_cartao(cartao, frequencia_global, saltos_frequentes, pares_comuns,
         'pares_históricos': pares_encontrados,
         'trincas_históricas': trincas_encontradas
     }
+
+def _marcar_combinacoes(comuns, tamanho):
+    """Vetor booleano, indexado pelo rank, com as combinações listadas em `comuns`."""
+    marcadas = np.zeros(total_combinacoes(tamanho), dtype=bool)
+    if len(comuns):
+        marcadas[ranquear(np.sort([c[0] for c in comuns], axis=1))] = True
+    return marcadas
+
+@instrumentado()
+def analisar_cartoes(cartoes, frequencia_global, saltos_frequentes, pares_comuns, trincas_comuns,
+                     tamanho_lote=200_000):
+    """Versão em lote de `analisar_cartao` para um array M×5 de cartões.
+
+    Retorna um DataFrame com uma linha por cartão; saltos comuns e pares/trincas
+    históricos vêm como contagens. As buscas usam tabelas indexadas pelo rank.
+    """
+    cartoes = np.sort(np.asarray(cartoes, dtype=np.int64).reshape(-1, 5), axis=1)
+
+    tabela_freq = np.zeros(TOTAL_DEZENAS + 1)
+    for dezena, freq in frequencia_global.items():
+        tabela_freq[dezena] = freq
+    saltos_frequentes = np.fromiter(saltos_frequentes, dtype=np.int64)
+    pares_marcados = _marcar_combinacoes(pares_comuns, 2)
+    trincas_marcadas = _marcar_combinacoes(trincas_comuns, 3)
+
+    partes = []
+    for inicio in range(0, max(len(cartoes), 1), tamanho_lote):
+        lote = cartoes[inicio:inicio + tamanho_lote]
+        pares = (lote % 2 == 0).sum(axis=1)
+        quadrantes = contar_por_classe((lote - 1) // 20, 4)
+        saltos = np.diff(lote, axis=1)
+
+        parte = {f'd{i + 1}': lote[:, i] for i in range(5)}
+        parte.update({
+            'soma': lote.sum(axis=1),
+            'pares': pares,
+            'ímpares': 5 - pares,
+            'frequência_média': np.round(tabela_freq[lote].mean(axis=1), 2),
+        })
+        parte.update({f'q{i + 1}': quadrantes[:, i] for i in range(4)})
+        parte.update({f'salto_{i + 1}': saltos[:, i] for i in range(4)})
+        parte['saltos_comuns'] = np.isin(saltos, saltos_frequentes).sum(axis=1)
+        parte['pares_históricos'] = pares_marcados[ranquear(lote[:, POSICOES_COMBINACOES[2]])].sum(axis=1)
+        parte['trincas_históricas'] = trincas_marcadas[ranquear(lote[:, POSICOES_COMBINACOES[3]])].sum(axis=1)
+        partes.append(pd.DataFrame(parte))
+    return pd.concat(partes, ignore_index=True)
@@ -1,147 +1,136 @@
 
 import streamlit as st
-import pandas as pd
-from collections import Counter
-from itertools import combinations
-import requests
-from time import sleep
-import random
+from contextlib import contextmanager
+import json
+from time import perf_counter
+
+from armazenamento import abrir_banco
+from acumuladores import sincronizar_acumuladores
+from agregados import estatisticas_agregadas
+from analise_cartao import analisar_saltos
+from cobertura import metricas_cobertura, otimizar_cobertura
+from coleta_dados import CONTROLADOR
+from conferencia import FAIXAS_PREMIO, conferir_cartoes
+from estatisticas_basicas import calcular_estatisticas
+from geracao_paralela import gerar_cartoes
+from instrumentacao import INSTRUMENTACAO, Instrumentacao, etapa, usar
+from janelas import JanelasFrequencia
+from padroes_ocultos import analisar_padroes_ocultos
+from probabilidade_premios import TOTAL_RESULTADOS, distribuicao_premios, resumo_premios
+from servico_dados import ServicoDados
+from simulacao import comparar_com_modelo_nulo
+from transicoes import DEFASAGENS_PADRAO, MatrizTransicoes
 
 # ==================== FUNÇÕES ====================
 
-@st.cache_data(show_spinner=True)
-def obter_todos_concursos(qtd):
-    concursos = []
-    ultimo_concurso = 6740
-    inicio = max(1, ultimo_concurso - qtd + 1)
-    progresso = st.progress(0)
-
-    for i, n in enumerate(range(inicio, ultimo_concurso + 1), 1):
-        try:
-            url = f"https://servicebus2.caixa.gov.br/portaldeloterias/api/quina/{n}"
-            resposta = requests.get(url, timeout=10)
-            resposta.raise_for_status()
-            dados = resposta.json()
-            dezenas = list(map(int, dados['listaDezenas']))
-            concursos.append({'concurso': dados['numero'], 'dezenas': dezenas, 'data': dados['dataApuracao']})
-        except Exception as e:
-            st.warning(f"Erro ao baixar concurso {n}: {e}")
-        progresso.progress(i / qtd)
-        sleep(0.15)
-    df = pd.DataFrame(concursos).sort_values('concurso').reset_index(drop=True)
-    return df
-
-def calcular_estatisticas(df):
-    df = df.copy()
-    df['soma'] = df['dezenas'].apply(sum)
-    df['pares'] = df['dezenas'].apply(lambda d: sum(1 for x in d if x % 2 == 0))
-    df['ímpares'] = df['dezenas'].apply(lambda d: 5 - sum(1 for x in d if x % 2 == 0))
-
-    def quadrantes(dezenas):
-        q = [0, 0, 0, 0]
-        for n in dezenas:
-            if 1 <= n <= 20: q[0] += 1
-            elif 21 <= n <= 40: q[1] += 1
-            elif 41 <= n <= 60: q[2] += 1
-            elif 61 <= n <= 80: q[3] += 1
-        return q
-
-    quadrantes_split = df['dezenas'].apply(quadrantes)
-    df[['q1', 'q2', 'q3', 'q4']] = pd.DataFrame(quadrantes_split.tolist(), index=df.index)
-
-    repetidas = [0]
-    for i in range(1, len(df)):
-        atual = set(df.loc[i, 'dezenas'])
-        anterior = set(df.loc[i - 1, 'dezenas'])
-        repetidas.append(len(atual & anterior))
-    df['repetidas'] = repetidas
-    return df
-
-def analisar_saltos(df):
-    saltos = []
-    for dezenas in df['dezenas']:
-        dezenas_ordenadas = sorted(dezenas)
-        saltos.extend([b - a for a, b in zip(dezenas_ordenadas, dezenas_ordenadas[1:])])
-    contagem_saltos = Counter(saltos)
-    return dict(sorted(contagem_saltos.items()))
-
-def analisar_padroes_ocultos(df):
-    df = df.copy()
-
-    def faixa_numerica(dezenas):
-        baixa = sum(1 for d in dezenas if 1 <= d <= 26)
-        media = sum(1 for d in dezenas if 27 <= d <= 53)
-        alta = sum(1 for d in dezenas if 54 <= d <= 80)
-        return baixa, media, alta
-
-    faixas = df['dezenas'].apply(faixa_numerica)
-    df[['faixa_baixa', 'faixa_media', 'faixa_alta']] = pd.DataFrame(faixas.tolist(), index=df.index)
-
-    def colunas(dezenas):
-        col = [0] * 10
-        for d in dezenas:
-            col[d % 10] += 1
-        return col
-
-    colunas_dist = df['dezenas'].apply(colunas)
-    col_df = pd.DataFrame(colunas_dist.tolist(), index=df.index)
-    col_df.columns = [f'col_{i}' for i in range(10)]
-    df = pd.concat([df, col_df], axis=1)
-
-    def linhas(dezenas):
-        linha = [0] * 8
-        for d in dezenas:
-            index = (d - 1) // 10
-            linha[index] += 1
-        return linha
-
-    linhas_dist = df['dezenas'].apply(linhas)
-    lin_df = pd.DataFrame(linhas_dist.tolist(), index=df.index)
-    lin_df.columns = [f'linha_{i+1}' for i in range(8)]
-    df = pd.concat([df, lin_df], axis=1)
-
-    df['distancias'] = df['dezenas'].apply(lambda x: [b - a for a, b in zip(sorted(x), sorted(x)[1:])])
-    df['amplitude'] = df['dezenas'].apply(lambda x: max(x) - min(x))
-    df['min'] = df['dezenas'].apply(min)
-    df['max'] = df['dezenas'].apply(max)
-    df['media'] = df['dezenas'].apply(lambda x: round(sum(x) / len(x), 2))
-
-    def sequencias_consecutivas(dezenas):
-        dezenas = sorted(dezenas)
-        contagem = 0
-        for i in range(len(dezenas) - 1):
-            if dezenas[i+1] - dezenas[i] == 1:
-                contagem += 1
-        return contagem
-
-    df['sequencias'] = df['dezenas'].apply(sequencias_consecutivas)
-    return df
-
-def estatisticas_agregadas(df):
-    resumo = {}
-    for faixa in ['faixa_baixa', 'faixa_media', 'faixa_alta']:
-        resumo[faixa + '_média'] = df[faixa].mean()
-        resumo[faixa + '_mais_comum'] = df[faixa].mode()[0]
-    resumo['média_geral'] = df['media'].mean()
-    resumo['amplitude_média'] = df['amplitude'].mean()
-    resumo['sequências_média'] = df['sequencias'].mean()
-    resumo['sequências_max'] = df['sequencias'].max()
-    linha_soma = df[[f'linha_{i}' for i in range(1, 9)]].sum()
-    coluna_soma = df[[f'col_{i}' for i in range(10)]].sum()
-    resumo['linha_mais_frequente'] = linha_soma.idxmax()
-    resumo['coluna_mais_frequente'] = coluna_soma.idxmax()
-    return resumo
-
-def calcular_frequencia_global(df):
-    contagem = Counter()
-    for dezenas in df['dezenas']:
-        contagem.update(dezenas)
-    return contagem
+@st.cache_resource
+def servico_dados():
+    # Um só serviço por processo: todas as sessões compartilham a coleta e as tabelas derivadas
+    return ServicoDados()
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def resumo_historico_completo():
+    # Acumuladores persistidos: só os concursos novos do banco são processados
+    conexao = abrir_banco()
+    try:
+        return sincronizar_acumuladores(conexao).resumo()
+    finally:
+        conexao.close()
+
+# Tabelas derivadas: calculadas uma vez por conteúdo dos sorteios e compartilhadas entre sessões
+
+def estatisticas_da_janela(matriz):
+    return servico_dados().derivado(matriz, 'estatisticas', calcular_estatisticas)
+
+def padroes_da_janela(matriz):
+    return servico_dados().derivado(
+        matriz, 'padroes', lambda m: analisar_padroes_ocultos(estatisticas_da_janela(m))
+    )
+
+def resumo_da_janela(matriz):
+    return servico_dados().derivado(matriz, 'resumo', lambda m: estatisticas_agregadas(padroes_da_janela(m)))
+
+def saltos_da_janela(matriz):
+    return servico_dados().derivado(matriz, 'saltos', analisar_saltos)
+
+def janelas_da_matriz(matriz):
+    return servico_dados().derivado(matriz, 'janelas', JanelasFrequencia)
+
+def transicoes_da_janela(matriz):
+    return servico_dados().derivado(matriz, 'transicoes', lambda m: MatrizTransicoes(m, DEFASAGENS_PADRAO))
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def probabilidades_dos_cartoes(cartoes):
+    # `cartoes` como tupla de tuplas para servir de chave do cache
+    # Sem pool de processos: criar um a cada clique, dentro do servidor com várias threads, custa
+    # mais do que o cálculo com as 40 dezenas do pool (e o fork numa app com threads é arriscado)
+    tabela = resumo_premios(distribuicao_premios(cartoes, processos=1))
+    return tabela.assign(**{
+        'prob_algum_cartão': (tabela['prob_algum_cartão'] * 100).map("{:.4g}%".format),
+        'chance_1_em': tabela['chance_1_em'].map("{:,.1f}".format),
+        'prob_melhor_faixa': (tabela['prob_melhor_faixa'] * 100).map("{:.4g}%".format),
+        'cartões_esperados': tabela['cartões_esperados'].round(4),
+    })
+
+@contextmanager
+def secao(rotulo, chave):
+    """Expander cujo conteúdo só é calculado quando está aberto."""
+    try:
+        expander = st.expander(rotulo, key=chave, on_change="rerun")
+    except TypeError:  # Streamlit sem estado de expander: calcula sempre
+        expander = st.expander(rotulo)
+    with expander, etapa(f"seção: {chave}"):
+        yield getattr(expander, 'open', None) is not False
+
+def painel_instrumentacao():
+    """Resumo da instrumentação desta execução, na barra lateral."""
+    resumo_instr = INSTRUMENTACAO.resumo()
+    with st.sidebar.expander("⏱️ Tempos desta execução", expanded=True):
+        etapas = sorted(resumo_instr['etapas'].items(), key=lambda item: -item[1]['tempo_total_s'])
+        st.dataframe([{'etapa': nome, **valores} for nome, valores in etapas], hide_index=True)
+
+        http = resumo_instr['http']
+        st.markdown(
+            f"**HTTP:** {http['requisicoes']} requisições · {http['falhas']} falhas · "
+            f"{http['tentativas_extras']} tentativas extras · latência média {http['latencia_media_ms']:.0f} ms"
+        )
+        taxa = CONTROLADOR.resumo()
+        st.markdown(
+            f"**Controle de taxa:** {taxa['taxa']} req/s · {taxa['limitadas']} respostas 429 · "
+            f"disjuntor aberto {taxa['aberturas']} vezes"
+        )
+        if http['requisicoes']:
+            st.dataframe(
+                [{'latência': faixa, 'requisições': qtd} for faixa, qtd in http['histograma'].items()],
+                hide_index=True
+            )
+        for nome, cache in resumo_instr['cache'].items():
+            taxa = f"{cache['taxa_acerto']:.0%}" if cache['taxa_acerto'] is not None else "—"
+            st.markdown(f"**Cache {nome}:** {cache['acertos']} acertos · {cache['faltas']} faltas ({taxa})")
+
+        st.download_button(
+            "📥 Baixar trace JSON", json.dumps(INSTRUMENTACAO.para_trace(), ensure_ascii=False),
+            file_name="trace_quina.json", mime="application/json"
+        )
 
 # ===================== INTERFACE =====================
 
 st.set_page_config(page_title="Quina Inteligente", layout="centered")
 
+with st.sidebar:
+    instrumentar = st.toggle("⏱️ Medir tempos das etapas", value=False)
+    medir_memoria = st.checkbox("Medir memória (mais lento)", value=False, disabled=not instrumentar)
+# Coletor só desta execução da sessão: não liga, desliga nem apaga a coleta das outras
+anterior = st.session_state.pop('instrumentacao', None)
+if anterior is not None:
+    anterior.desativar()  # execução anterior interrompida antes do fim da página
+if instrumentar:
+    st.session_state['instrumentacao'] = usar(Instrumentacao())
+    INSTRUMENTACAO.ativar(medir_memoria)
+else:
+    usar(None)
+inicio_pagina = perf_counter()
+
 st.title("🔍 Análise Inteligente da Quina")
 
 st.header("📥 Coleta de Dados")
@@ -153,74 +142,142 @@ quantidade_concursos = st.select_slider(
     value=500
 )
 
-with st.spinner("🔄 Coletando concursos da Quina..."):
-    df_todos = obter_todos_concursos(quantidade_concursos)
+with st.spinner("🔄 Coletando concursos da Quina..."), etapa("carregar concursos"):
+    # Só o que ainda não está no banco local é baixado; o resto vem do disco (ou do arquivo
+    # oficial em dados/). Se outra sessão já estiver carregando, esta espera pela mesma carga.
+    progresso = st.empty()
+    matriz = servico_dados().concursos(
+        quantidade_concursos, ao_progredir=lambda feitos, total: progresso.progress(feitos / total)
+    )
+    progresso.empty()
 
-if df_todos.empty:
+if len(matriz) == 0:
     st.error("Nenhum concurso foi carregado. Tente novamente mais tarde.")
     st.stop()
 
-df_estatisticas = calcular_estatisticas(df_todos)
-df_padroes = analisar_padroes_ocultos(df_estatisticas)
+janelas = janelas_da_matriz(matriz)
 
 st.header("📈 Análise Estatística")
 
-with st.expander("➕ Soma das dezenas"):
-    st.line_chart(df_estatisticas['soma'])
+with secao("➕ Soma das dezenas", "exp_soma") as aberta:
+    if aberta:
+        st.line_chart(estatisticas_da_janela(matriz)['soma'])
 
-with st.expander("♻️ Repetição de dezenas entre concursos"):
-    st.bar_chart(df_estatisticas['repetidas'].value_counts().sort_index())
+with secao("♻️ Repetição de dezenas entre concursos", "exp_repetidas") as aberta:
+    if aberta:
+        st.bar_chart(estatisticas_da_janela(matriz)['repetidas'].value_counts().sort_index())
 
-with st.expander("⚖️ Quantidade de Pares e Ímpares"):
-    st.dataframe(df_estatisticas[['concurso', 'pares', 'ímpares']])
+with secao("⚖️ Quantidade de Pares e Ímpares", "exp_pares") as aberta:
+    if aberta:
+        st.dataframe(estatisticas_da_janela(matriz)[['concurso', 'pares', 'ímpares']])
 
-with st.expander("🧭 Distribuição por Quadrantes"):
-    st.dataframe(df_estatisticas[['concurso', 'q1', 'q2', 'q3', 'q4']])
+with secao("🧭 Distribuição por Quadrantes", "exp_quadrantes") as aberta:
+    if aberta:
+        st.dataframe(estatisticas_da_janela(matriz)[['concurso', 'q1', 'q2', 'q3', 'q4']])
 
 st.header("🔍 Padrões Ocultos")
 
-with st.expander("🔢 Faixas Numéricas"):
-    st.dataframe(df_padroes[['concurso', 'faixa_baixa', 'faixa_media', 'faixa_alta']])
-
-with st.expander("🧮 Colunas mais sorteadas"):
-    colunas_sum = df_padroes[[f'col_{i}' for i in range(10)]].sum().sort_values(ascending=False)
-    st.dataframe(colunas_sum)
-
-with st.expander("📏 Linhas mais frequentes"):
-    linhas_sum = df_padroes[[f'linha_{i+1}' for i in range(8)]].sum().sort_values(ascending=False)
-    st.dataframe(linhas_sum)
-
-with st.expander("🎯 Sequências consecutivas"):
-    st.bar_chart(df_padroes['sequencias'].value_counts().sort_index())
-
-with st.expander("↔️ Estatísticas diversas"):
-    st.dataframe(df_padroes[['concurso', 'min', 'max', 'media', 'amplitude']])
-
-with st.expander("🧬 Saltos entre dezenas"):
-    st.write(analisar_saltos(df_todos))
-
-resumo = estatisticas_agregadas(df_padroes)
+with secao("🔢 Faixas Numéricas", "exp_faixas") as aberta:
+    if aberta:
+        st.dataframe(padroes_da_janela(matriz)[['concurso', 'faixa_baixa', 'faixa_media', 'faixa_alta']])
+
+with secao("🧮 Colunas mais sorteadas", "exp_colunas") as aberta:
+    if aberta:
+        df_padroes = padroes_da_janela(matriz)
+        colunas_sum = df_padroes[[f'col_{i}' for i in range(10)]].sum().sort_values(ascending=False)
+        st.dataframe(colunas_sum)
+
+with secao("📏 Linhas mais frequentes", "exp_linhas") as aberta:
+    if aberta:
+        df_padroes = padroes_da_janela(matriz)
+        linhas_sum = df_padroes[[f'linha_{i+1}' for i in range(8)]].sum().sort_values(ascending=False)
+        st.dataframe(linhas_sum)
+
+with secao("🎯 Sequências consecutivas", "exp_sequencias") as aberta:
+    if aberta:
+        st.bar_chart(padroes_da_janela(matriz)['sequencias'].value_counts().sort_index())
+
+with secao("↔️ Estatísticas diversas", "exp_diversas") as aberta:
+    if aberta:
+        st.dataframe(padroes_da_janela(matriz)[['concurso', 'min', 'max', 'media', 'amplitude']])
+
+with secao("🧬 Saltos entre dezenas", "exp_saltos") as aberta:
+    if aberta:
+        st.write(saltos_da_janela(matriz))
+
+with secao("⏳ Frequência e atraso por janela", "exp_atrasos") as aberta:
+    if aberta:
+        primeiro, ultimo = st.select_slider(
+            "Janela de concursos:",
+            options=matriz.concursos.tolist(),
+            value=(int(matriz.concursos[0]), int(matriz.concursos[-1]))
+        )
+        inicio, fim = janelas.posicao_do_concurso(primeiro), janelas.posicao_do_concurso(ultimo + 1)
+        st.dataframe(janelas.tabela_atrasos(inicio, fim), hide_index=True)
+
+with secao("🔁 Dezenas que costumam vir depois do último concurso", "exp_transicoes") as aberta:
+    if aberta:
+        defasagem = st.select_slider("Quantos concursos à frente:", options=list(DEFASAGENS_PADRAO), value=1)
+        ultimo_resultado = "   ".join(f"{d:02d}" for d in matriz.dezenas[-1])
+        st.caption(f"Frequência de cada dezena {defasagem} concurso(s) depois de sorteios com as dezenas do "
+                   f"último resultado (`{ultimo_resultado}`), comparada à frequência base.")
+        st.dataframe(transicoes_da_janela(matriz).proximas(k=defasagem, top=10), hide_index=True)
+
+resumo = resumo_da_janela(matriz)
 
 st.header("📊 Estatísticas Agregadas")
 st.write(resumo)
 
+with secao("🗄️ Todo o histórico armazenado", "exp_historico") as aberta:
+    if aberta:
+        st.write(resumo_historico_completo())
+
+with secao("🎲 Comparação com o acaso (Monte Carlo)", "exp_monte_carlo") as aberta:
+    if aberta:
+        st.caption("Simula sorteios uniformes e mostra onde cada agregado observado cai na distribuição do acaso.")
+        total_simulado = st.select_slider(
+            "Sorteios simulados:", options=[100_000, 1_000_000, 10_000_000], value=1_000_000
+        )
+        if st.button("🎲 Simular"):
+            with st.spinner("Simulando sorteios aleatórios..."):
+                st.dataframe(comparar_com_modelo_nulo(matriz, total_simulado, semente=0), hide_index=True)
+
 st.header("🎲 Gerador Inteligente de Cartões")
 
 qtd_cartoes = st.slider("Quantidade de cartões a gerar:", 1, 120, 50)
+otimizar = st.checkbox("🧩 Otimizar cobertura de pares e trincas (evita cartões sobrepostos)", value=True)
+# Sem semente, cada clique gera um conjunto novo; com ela, os mesmos cartões se repetem
+semente = st.number_input("Semente (opcional, a mesma semente gera os mesmos cartões):",
+                          min_value=0, value=None, step=1, placeholder="aleatória")
+semente = int(semente) if semente is not None else None
 
 if st.button("🧠 Gerar Cartões Inteligentes"):
     st.subheader("🃏 Cartões Gerados:")
 
-    freq = df_padroes['dezenas'].explode().value_counts()
-    top_dezenas = freq.nlargest(40).index.tolist()
+    top_dezenas = janelas.top_dezenas(40).index.tolist()
 
-    cartoes = []
-    for _ in range(qtd_cartoes):
-        cartao = sorted(random.sample(top_dezenas, 5))
-        cartoes.append(cartao)
+    if otimizar:
+        with st.spinner("🧩 Otimizando cobertura..."):
+            cartoes = otimizar_cobertura(top_dezenas, qtd_cartoes, rng=semente).tolist()
+    else:
+        cartoes = gerar_cartoes(qtd_cartoes, semente=semente, dezenas=top_dezenas).tolist()
 
     st.session_state['cartoes'] = cartoes  # Armazenar para conferência
 
+    metricas = metricas_cobertura(cartoes, top_dezenas)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Cartões distintos", f"{metricas['cartões_distintos']}/{metricas['cartões']}")
+    col2.metric("Pares cobertos", f"{metricas['pares_cobertos']}/{metricas['pares_total']}",
+                f"{metricas['cobertura_pares_%']}%", delta_color="off")
+    col3.metric("Trincas cobertas", f"{metricas['trincas_cobertas']}/{metricas['trincas_total']}",
+                f"{metricas['cobertura_trincas_%']}%", delta_color="off")
+
+    with st.spinner("🎯 Calculando a chance exata de prêmio..."):
+        probabilidades = probabilidades_dos_cartoes(tuple(map(tuple, cartoes)))
+    total_formatado = f"{TOTAL_RESULTADOS:,}".replace(",", ".")
+    st.markdown(f"**🎯 Chance de prêmio no próximo concurso** (exata, sobre os {total_formatado} resultados possíveis)")
+    st.dataframe(probabilidades, hide_index=True)
+
     for i, cartao in enumerate(cartoes, 1):
         dezenas_formatadas = "   ".join(f"{d:02d}" for d in cartao)
         st.markdown(f"**Cartão {i}:** `{dezenas_formatadas}`")
@@ -229,39 +286,28 @@ if st.button("🧠 Gerar Cartões Inteligentes"):
 
 st.header("✅ Conferência de Cartões Gerados")
 
-qtd_ultimos = st.slider("Quantos concursos recentes deseja conferir?", 1, 10, 3)
+qtd_ultimos = st.slider(
+    "Quantos concursos recentes deseja conferir?", 1, max(len(matriz), 2), min(3, len(matriz))
+)
 
 if st.button("📋 Conferir Cartões"):
     if 'cartoes' not in st.session_state or not st.session_state['cartoes']:
         st.warning("⚠️ Nenhum cartão gerado ainda. Gere os cartões primeiro.")
     else:
         cartoes = st.session_state['cartoes']
-        concursos_para_conferir = df_todos.tail(qtd_ultimos).reset_index(drop=True)
+        premios_cartao, premios_concurso = conferir_cartoes(cartoes, matriz[-qtd_ultimos:])
         st.subheader(f"Verificando contra os últimos {qtd_ultimos} concursos:")
 
-        for idx, linha in concursos_para_conferir.iterrows():
-            dezenas_resultado = set(linha['dezenas'])
-            st.markdown(f"### Concurso {linha['concurso']} ({linha['data']}) - Resultado: `{sorted(dezenas_resultado)}`")
-
-            houve_premio = False
-            for i, cartao in enumerate(cartoes, 1):
-                acertos = len(set(cartao) & dezenas_resultado)
-                
-                if acertos >= 2:  # Exibe apenas prêmios: duque, terno, quadra, quina
-                    houve_premio = True
-                    if acertos == 5:
-                        status = "🏆 **QUINA!**"
-                    elif acertos == 4:
-                        status = "🎯 **QUADRA**"
-                    elif acertos == 3:
-                        status = "✅ **TERNO**"
-                    else:  # acertos == 2
-                        status = "💰 **DUQUE**"
-                    dezenas_formatadas = "   ".join(f"{d:02d}" for d in cartao)
-                    st.markdown(f"- **Cartão {i}**: `{dezenas_formatadas}` → **{acertos} acertos** → {status}")
-
-            if not houve_premio:
-                st.markdown("_Nenhum cartão premiado neste concurso._")
+        faixas = list(FAIXAS_PREMIO.values())
+        premiados = premios_concurso[premios_concurso[faixas].sum(axis=1) > 0]
+        if premiados.empty:
+            st.markdown("_Nenhum cartão premiado nos concursos conferidos._")
+        else:
+            st.markdown("**🏆 Cartões premiados por concurso** (duque, terno, quadra e quina)")
+            st.dataframe(premiados.iloc[::-1], hide_index=True)
+
+        st.markdown("**🃏 Prêmios acumulados por cartão**")
+        st.dataframe(premios_cartao)
 
 
 def rodape():
@@ -275,3 +321,9 @@ def rodape():
     """, unsafe_allow_html=True)
 
 rodape()
+
+if instrumentar:
+    INSTRUMENTACAO.registrar_etapa("página", inicio_pagina, perf_counter() - inicio_pagina)
+    INSTRUMENTACAO.desativar()
+    st.session_state.pop('instrumentacao', None)
+    painel_instrumentacao()
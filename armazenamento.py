@@ -0,0 +1,74 @@
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+CAMINHO_BANCO = Path(__file__).with_name("quina.sqlite3")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS concursos (
+    concurso INTEGER PRIMARY KEY,
+    data TEXT NOT NULL,
+    d1 INTEGER NOT NULL,
+    d2 INTEGER NOT NULL,
+    d3 INTEGER NOT NULL,
+    d4 INTEGER NOT NULL,
+    d5 INTEGER NOT NULL
+)
+"""
+
+def abrir_banco(caminho=CAMINHO_BANCO):
+    """Abre (criando se preciso) o banco local de concursos."""
+    conexao = sqlite3.connect(str(caminho))
+    conexao.execute(_ESQUEMA)
+    return conexao
+
+def maior_concurso(conexao):
+    """Maior número de concurso armazenado (0 se o banco estiver vazio)."""
+    (maior,) = conexao.execute("SELECT COALESCE(MAX(concurso), 0) FROM concursos").fetchone()
+    return maior
+
+def concursos_armazenados(conexao, inicio, fim):
+    """Conjunto dos números de concurso já armazenados no intervalo [inicio, fim]."""
+    linhas = conexao.execute(
+        "SELECT concurso FROM concursos WHERE concurso BETWEEN ? AND ?", (inicio, fim)
+    )
+    return {concurso for (concurso,) in linhas}
+
+def salvar_concursos(conexao, concursos):
+    """Grava (ou substitui) concursos no formato {'concurso', 'data', 'dezenas'}."""
+    linhas = [(c['concurso'], c['data'], *sorted(c['dezenas'])) for c in concursos]
+    with conexao:
+        conexao.executemany("INSERT OR REPLACE INTO concursos VALUES (?, ?, ?, ?, ?, ?, ?)", linhas)
+    return len(linhas)
+
+def contar_concursos(conexao, ate=None):
+    """Quantos concursos estão armazenados (apenas até o número `ate`, se informado)."""
+    if ate is None:
+        (total,) = conexao.execute("SELECT COUNT(*) FROM concursos").fetchone()
+    else:
+        (total,) = conexao.execute("SELECT COUNT(*) FROM concursos WHERE concurso <= ?", (ate,)).fetchone()
+    return total
+
+def carregar_concursos(conexao, qtd=None, apos=None):
+    """Carrega os `qtd` concursos mais recentes (ou todos) em ordem crescente.
+
+    Com `apos`, considera apenas os concursos de número maior que ele.
+    """
+    consulta = "SELECT concurso, data, d1, d2, d3, d4, d5 FROM concursos"
+    parametros = ()
+    if apos is not None:
+        consulta += " WHERE concurso > ?"
+        parametros = (int(apos),)
+    consulta += " ORDER BY concurso DESC"
+    if qtd is not None:
+        consulta += " LIMIT ?"
+        parametros += (int(qtd),)
+    linhas = conexao.execute(consulta, parametros).fetchall()
+    linhas.reverse()
+
+    return pd.DataFrame({
+        'concurso': [l[0] for l in linhas],
+        'dezenas': [list(l[2:]) for l in linhas],
+        'data': [l[1] for l in linhas],
+    })
@@ -0,0 +1,175 @@
+"""Benchmarks das etapas de análise com históricos sintéticos (roda offline, sem Streamlit).
+
+Exemplos:
+    python benchmarks.py --rapido --saida resultados.json
+    python benchmarks.py --saida novo.json --comparar resultados.json
+"""
+import argparse
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from analise_cartao import (
+    analisar_cartao, analisar_cartoes, analisar_saltos, calcular_frequencia_global, combinacoes_mais_comuns
+)
+from conferencia import conferir_cartoes
+from estatisticas_basicas import calcular_estatisticas
+from estatisticas_probabilidades import (
+    amostrar_cartoes, comparar_cartoes_com_padroes, estatisticas_agregadas, gerar_cartao_inteligente
+)
+from geracao_paralela import gerar_cartoes
+from matriz_sorteios import MatrizSorteios
+from padroes_ocultos import analisar_padroes_ocultos
+
+HISTORICOS = [1_000, 10_000, 100_000, 1_000_000]
+CARTOES = [100, 10_000, 1_000_000]
+
+def gerar_historico_sintetico(quantidade, semente=0):
+    """Histórico determinístico de `quantidade` sorteios uniformes, numerados a partir de 1."""
+    dezenas = amostrar_cartoes(quantidade, np.random.default_rng(semente))
+    datas = pd.date_range('2000-01-01', periods=quantidade, freq='D').strftime('%d/%m/%Y')
+    return MatrizSorteios(dezenas, np.arange(1, quantidade + 1), datas.to_numpy(dtype=object))
+
+def _medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    gc.collect()
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(tempos), pico / 2 ** 20
+
+def etapas(historico, cartoes):
+    """Etapas medidas: nome -> (função sem argumentos, cartões usados ou None)."""
+    df = historico.para_dataframe()
+    df_padroes = analisar_padroes_ocultos(calcular_estatisticas(historico))
+    resumo = estatisticas_agregadas(df_padroes)
+    frequencia = calcular_frequencia_global(historico)
+    saltos = dict(list(analisar_saltos(historico).items())[:5])
+    pares = combinacoes_mais_comuns(historico, 2, 50)
+    trincas = combinacoes_mais_comuns(historico, 3, 50)
+    # O laço em Python e a conferência são limitados para não dominar a execução
+    poucos = cartoes[:10_000]
+
+    return {
+        'calcular_estatisticas': (lambda: calcular_estatisticas(df), None),
+        'analisar_padroes_ocultos': (lambda: analisar_padroes_ocultos(df), None),
+        'estatisticas_agregadas': (lambda: estatisticas_agregadas(df_padroes), None),
+        'combinacoes_mais_comuns_pares': (lambda: combinacoes_mais_comuns(historico, 2, 10), None),
+        'combinacoes_mais_comuns_trincas': (lambda: combinacoes_mais_comuns(historico, 3, 10), None),
+        'analisar_cartao': (
+            lambda: [analisar_cartao(c, frequencia, saltos, pares, trincas) for c in poucos.tolist()], len(poucos)
+        ),
+        'analisar_cartoes': (lambda: analisar_cartoes(cartoes, frequencia, saltos, pares, trincas), len(cartoes)),
+        'gerar_cartao_inteligente': (lambda: gerar_cartao_inteligente(resumo, len(cartoes), rng=0), len(cartoes)),
+        'gerar_cartoes_distintos': (lambda: gerar_cartoes(len(cartoes), semente=0, resumo=resumo), len(cartoes)),
+        'conferir_cartoes': (lambda: conferir_cartoes(poucos, historico), len(poucos)),
+        'comparar_cartoes_com_padroes': (lambda: comparar_cartoes_com_padroes(poucos, df_padroes), len(poucos)),
+    }
+
+# Etapas cujo custo não depende do tamanho do histórico
+_SO_CARTOES = {'analisar_cartao', 'analisar_cartoes', 'gerar_cartao_inteligente', 'gerar_cartoes_distintos'}
+
+def executar(historicos, quantidades_cartoes, repeticoes=3, semente=0, filtro=None, ao_medir=None):
+    resultados = []
+    for n_concursos in historicos:
+        historico = gerar_historico_sintetico(n_concursos, semente)
+        medidos = set()
+        for i, n_cartoes in enumerate(quantidades_cartoes):
+            cartoes = amostrar_cartoes(n_cartoes, np.random.default_rng(semente + 1))
+            for nome, (funcao, cartoes_usados) in etapas(historico, cartoes).items():
+                if filtro and not any(f in nome for f in filtro):
+                    continue
+                # Etapas que não usam os cartões são medidas uma vez por histórico
+                if cartoes_usados is None and i > 0:
+                    continue
+                # Etapas que não usam o histórico são medidas só com o menor histórico
+                if nome in _SO_CARTOES and n_concursos != historicos[0]:
+                    continue
+                # Mesma etapa com os mesmos cartões (após o limite) não é medida duas vezes
+                if (nome, cartoes_usados) in medidos:
+                    continue
+                medidos.add((nome, cartoes_usados))
+                segundos, pico_mb = _medir(funcao, repeticoes)
+                resultado = {
+                    'etapa': nome,
+                    'concursos': n_concursos,
+                    'cartoes': cartoes_usados,
+                    'segundos': round(segundos, 6),
+                    'pico_memoria_mb': round(pico_mb, 3),
+                }
+                resultados.append(resultado)
+                if ao_medir:
+                    ao_medir(resultado)
+    return resultados
+
+def comparar(atual, anterior):
+    """Junta dois conjuntos de resultados pela chave (etapa, concursos, cartoes)."""
+    chave = lambda r: (r['etapa'], r['concursos'], r['cartoes'])
+    antes = {chave(r): r for r in anterior}
+    linhas = []
+    for r in atual:
+        base = antes.get(chave(r))
+        if base:
+            linhas.append({
+                'etapa': r['etapa'], 'concursos': r['concursos'], 'cartoes': r['cartoes'],
+                'segundos_antes': base['segundos'], 'segundos_agora': r['segundos'],
+                'razao_tempo': round(r['segundos'] / base['segundos'], 3) if base['segundos'] else None,
+                'razao_memoria': (round(r['pico_memoria_mb'] / base['pico_memoria_mb'], 3)
+                                  if base['pico_memoria_mb'] else None),
+            })
+    return pd.DataFrame(linhas)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concursos', type=int, nargs='+', default=HISTORICOS)
+    parser.add_argument('--cartoes', type=int, nargs='+', default=CARTOES)
+    parser.add_argument('--rapido', action='store_true', help="só os menores tamanhos (10³ concursos, 10² e 10⁴ cartões)")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--etapas', nargs='+', help="mede só as etapas cujo nome contém um destes textos")
+    parser.add_argument('--saida', help="arquivo JSON com os resultados")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args(argv)
+
+    historicos, cartoes = (HISTORICOS[:1], CARTOES[:2]) if args.rapido else (args.concursos, args.cartoes)
+    resultados = executar(
+        sorted(historicos), sorted(cartoes), args.repeticoes, args.semente, args.etapas,
+        ao_medir=lambda r: print(f"{r['etapa']:<34} concursos={r['concursos']:<9} cartoes={str(r['cartoes']):<9} "
+                                 f"{r['segundos']:>10.4f}s {r['pico_memoria_mb']:>10.1f} MB", flush=True)
+    )
+
+    documento = {
+        'meta': {
+            'data': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'maquina': platform.platform(),
+            'semente': args.semente,
+            'repeticoes': args.repeticoes,
+        },
+        'resultados': resultados,
+    }
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(documento, arquivo, ensure_ascii=False, indent=2)
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            anterior = json.load(arquivo)['resultados']
+        print(comparar(resultados, anterior).to_string(index=False))
+
+if __name__ == '__main__':
+    main()
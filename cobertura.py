@@ -0,0 +1,117 @@
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from combinatoria import desranquear, ranquear
+from coocorrencia import POSICOES_COMBINACOES
+from instrumentacao import instrumentado
+
+def _ranks_locais(cartoes_locais):
+    """Ranks dos pares e trincas de cada cartão, no espaço de combinações do pool."""
+    pares = ranquear(cartoes_locais[:, POSICOES_COMBINACOES[2]] + 1)
+    trincas = ranquear(cartoes_locais[:, POSICOES_COMBINACOES[3]] + 1)
+    return pares, trincas
+
+def metricas_cobertura(cartoes, pool):
+    """Quantos pares e trincas distintos do pool os cartões cobrem."""
+    pool = set(int(d) for d in pool)
+    cartoes = np.asarray(cartoes).reshape(-1, 5).tolist()
+    pares, trincas = set(), set()
+    for cartao in cartoes:
+        dentro = sorted(d for d in cartao if d in pool)
+        pares.update(combinations(dentro, 2))
+        trincas.update(combinations(dentro, 3))
+
+    total_pares, total_trincas = comb(len(pool), 2), comb(len(pool), 3)
+    return {
+        'cartões': len(cartoes),
+        'cartões_distintos': len({tuple(sorted(c)) for c in cartoes}),
+        'pares_cobertos': len(pares),
+        'pares_total': total_pares,
+        'cobertura_pares_%': round(100 * len(pares) / total_pares, 2) if total_pares else 0.0,
+        'trincas_cobertas': len(trincas),
+        'trincas_total': total_trincas,
+        'cobertura_trincas_%': round(100 * len(trincas) / total_trincas, 2) if total_trincas else 0.0,
+    }
+
+@instrumentado()
+def otimizar_cobertura(pool, orcamento, peso_pares=1.0, peso_trincas=1.0, iteracoes_busca=300,
+                       amostra_vizinhanca=20_000, max_candidatos=1_000_000, rng=None):
+    """Escolhe `orcamento` cartões do pool que maximizam a cobertura de pares e trincas distintos.
+
+    Usa guloso preguiçoso (os ganhos só diminuem, então limites antigos continuam válidos)
+    sobre todos os C(len(pool), 5) cartões, seguido de busca local por trocas que aumentam
+    a cobertura. Retorna um array orcamento×5 com as dezenas em ordem crescente.
+    """
+    rng = np.random.default_rng(rng)
+    pool = np.unique(np.asarray(pool, dtype=np.int64))
+    if len(pool) < 5:
+        raise ValueError("O pool precisa ter pelo menos 5 dezenas")
+
+    # Na ordem colexicográfica, os ranks < C(P, 5) são exatamente os cartões dentro do pool
+    total = comb(len(pool), 5)
+    if total <= max_candidatos:
+        ranks = np.arange(total)
+    else:
+        ranks = np.sort(rng.choice(total, size=max_candidatos, replace=False))
+    candidatos = desranquear(ranks, 5) - 1
+    orcamento = min(orcamento, len(candidatos))
+    ranks_pares, ranks_trincas = _ranks_locais(candidatos)
+    ranks_pares = ranks_pares.astype(np.int32)
+    ranks_trincas = ranks_trincas.astype(np.int32)
+
+    cobertura_pares = np.zeros(comb(len(pool), 2), dtype=np.int32)
+    cobertura_trincas = np.zeros(comb(len(pool), 3), dtype=np.int32)
+
+    def ganho(indices):
+        return (peso_pares * (cobertura_pares[ranks_pares[indices]] == 0).sum(axis=1)
+                + peso_trincas * (cobertura_trincas[ranks_trincas[indices]] == 0).sum(axis=1))
+
+    def aplicar(indice, sinal):
+        np.add.at(cobertura_pares, ranks_pares[indice], sinal)
+        np.add.at(cobertura_trincas, ranks_trincas[indice], sinal)
+
+    # 1. Guloso preguiçoso
+    limites = np.full(len(candidatos), 10 * (peso_pares + peso_trincas))
+    atualizado = np.full(len(candidatos), -1)
+    escolhidos = []
+    bloco = 512
+    for passo in range(orcamento):
+        # Reavalia primeiro os maiores limites; depois, todos os que ainda superam o melhor ganho exato
+        topo = np.flatnonzero(limites == limites.max())[:bloco]
+        limites[topo] = ganho(topo)
+        atualizado[topo] = passo
+        while True:
+            melhor = int(np.argmax(np.where(atualizado == passo, limites, -np.inf)))
+            pendentes = np.flatnonzero((limites > limites[melhor]) & (atualizado != passo))
+            if not len(pendentes):
+                break
+            limites[pendentes] = ganho(pendentes)
+            atualizado[pendentes] = passo
+        escolhidos.append(melhor)
+        aplicar(melhor, 1)
+        limites[melhor] = -np.inf
+
+    # 2. Busca local: troca um cartão pelo melhor de uma amostra se a cobertura aumentar
+    escolhidos = np.array(escolhidos, dtype=np.intp)
+    maximo_pares = min(10 * orcamento, len(cobertura_pares))
+    maximo_trincas = min(10 * orcamento, len(cobertura_trincas))
+    for _ in range(iteracoes_busca if orcamento < len(candidatos) else 0):
+        if (np.count_nonzero(cobertura_pares) == maximo_pares
+                and np.count_nonzero(cobertura_trincas) == maximo_trincas):
+            break  # nenhuma troca pode melhorar
+        posicao = rng.integers(len(escolhidos))
+        atual = escolhidos[posicao]
+        aplicar(atual, -1)
+        perda = ganho(np.array([atual]))[0]
+
+        amostra = rng.integers(len(candidatos), size=min(amostra_vizinhanca, len(candidatos)))
+        amostra = amostra[~np.isin(amostra, escolhidos)]
+        ganhos = ganho(amostra)
+        if len(amostra) and ganhos.max() > perda:
+            atual = amostra[np.argmax(ganhos)]
+            escolhidos[posicao] = atual
+        aplicar(atual, 1)
+
+    return pool[candidatos[escolhidos]]
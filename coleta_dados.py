@@ -1,69 +1,237 @@
+import contextvars
 import requests
-import pandas as pd
-import streamlit as st
-from time import sleep
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from time import perf_counter, sleep
+
+from armazenamento import (
+    abrir_banco, carregar_concursos, concursos_armazenados, maior_concurso, salvar_concursos
+)
+from controle_taxa import CircuitoAberto, ControladorTaxa, falha_da_api
+from instrumentacao import INSTRUMENTACAO, instrumentado
 
 BASE_URL = "https://servicebus2.caixa.gov.br/portaldeloterias/api/quina/{}"
 HEADERS = {
     "Accept": "application/json",
     "User-Agent": "Mozilla/5.0"
 }
+MAX_CONEXOES = 8
+ULTIMO_CONCURSO_CONHECIDO = 6740
+
+# Compartilhado por todas as coletas do processo: a API vê um único cliente bem-comportado
+CONTROLADOR = ControladorTaxa()
+
+def _streamlit():
+    # Importado só quando há uma página para mostrar mensagens: o módulo não depende do Streamlit
+    import streamlit as st
+    return st
+
+def criar_sessao(max_conexoes=MAX_CONEXOES):
+    """Cria uma sessão HTTP com pool de conexões reaproveitáveis."""
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=max_conexoes, pool_maxsize=max_conexoes)
+    sessao.mount("https://", adaptador)
+    sessao.mount("http://", adaptador)
+    sessao.headers.update(HEADERS)
+    return sessao
+
+def _retry_after(response):
+    """Segundos pedidos no cabeçalho Retry-After (só a forma numérica)."""
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except (TypeError, ValueError):
+        return None
+
+def resumir_falhas(falhas):
+    """Uma única mensagem para a lista de (concurso, motivo) que não puderam ser baixados."""
+    motivos = Counter(motivo for _, motivo in falhas)
+    numeros = sorted(numero for numero, _ in falhas)
+    lista = ", ".join(map(str, numeros[:20])) + (f" e mais {len(numeros) - 20}" if len(numeros) > 20 else "")
+    detalhes = ", ".join(f"{motivo} ×{qtd}" for motivo, qtd in motivos.most_common())
+    return f"{len(numeros)} concursos não puderam ser baixados ({detalhes}): {lista}."
 
-def fetch_concurso(numero, max_retries=5, delay=0.3):
+def fetch_concurso(numero, max_retries=5, delay=0.3, sessao=None, base_url=BASE_URL, avisos=None,
+                   controlador=None, falhas=None):
+    # Tentativas intermediárias só ajustam o controlador de taxa; apenas a falha final é relatada:
+    # em `falhas` (lista de (concurso, motivo)), em `avisos` (lista de mensagens) ou na página.
+    controlador = controlador if controlador is not None else CONTROLADOR
+    cliente = sessao if sessao is not None else requests
+    motivo, tentativas = None, 0
     for tentativa in range(max_retries):
         try:
-            url = BASE_URL.format(numero)
-            response = requests.get(url, headers=HEADERS, timeout=10)
+            controlador.adquirir()
+        except CircuitoAberto:
+            motivo = "API indisponível"
+            break
+        tentativas += 1
+        inicio = perf_counter()
+        response = None
+        try:
+            url = base_url.format(numero)
+            response = cliente.get(url, headers=HEADERS, timeout=10)
             response.raise_for_status()
             data = response.json()
             dezenas = list(map(int, data["listaDezenas"]))
-            return {
-                "concurso": data["numero"],
-                "data": data["dataApuracao"],
-                "dezenas": dezenas
-            }
-        except requests.exceptions.HTTPError as e:
-            st.warning(f"HTTPError no concurso {numero}, tentativa {tentativa+1}/{max_retries}: {e}")
-            sleep(delay)
         except Exception as e:
-            st.warning(f"Erro inesperado no concurso {numero}, tentativa {tentativa+1}/{max_retries}: {e}")
-            sleep(delay)
-    st.error(f"Falha ao obter dados do concurso {numero} após {max_retries} tentativas.")
+            latencia = perf_counter() - inicio
+            status = response.status_code if response is not None else None
+            INSTRUMENTACAO.registrar_http(latencia, status, True, tentativa)
+            controlador.registrar_falha(status, _retry_after(response))
+            motivo = f"HTTP {status}" if isinstance(e, requests.exceptions.HTTPError) else type(e).__name__
+            if not falha_da_api(status) and isinstance(e, requests.exceptions.HTTPError):
+                break  # 4xx (ex.: concurso inexistente): repetir não adianta
+            if tentativa + 1 < max_retries:
+                sleep(controlador.espera_retentativa(tentativa, delay))
+            continue
+
+        latencia = perf_counter() - inicio
+        INSTRUMENTACAO.registrar_http(latencia, response.status_code, tentativa=tentativa)
+        controlador.registrar_sucesso(latencia)
+        return {
+            "concurso": data["numero"],
+            "data": data["dataApuracao"],
+            "dezenas": dezenas
+        }
+
+    if falhas is not None:
+        falhas.append((numero, motivo))
+        return None
+    mensagem = f"Falha ao obter dados do concurso {numero} após {tentativas} tentativas ({motivo})."
+    if avisos is not None:
+        avisos.append(mensagem)
+    else:
+        _streamlit().error(mensagem)
     return None
 
-@st.cache_data(show_spinner="🔄 Carregando concursos da Quina...")
-def obter_concursos_ate(limit=2500):
-    concursos = []
-    # Para pegar o último concurso da API Caixa (tentativa rápida)
+@instrumentado()
+def baixar_concursos(numeros, max_workers=MAX_CONEXOES, sessao=None, base_url=BASE_URL,
+                     ao_progredir=None, avisos=None, controlador=None):
+    """Baixa vários concursos em paralelo, reaproveitando uma única sessão HTTP.
+
+    Retorna os concursos obtidos em ordem crescente de número. `ao_progredir(feitos, total)`
+    é chamado na thread de quem chamou, a cada concurso concluído. O ritmo é ditado pelo
+    controlador de taxa compartilhado, e as falhas viram uma única mensagem no final.
+    """
+    numeros = sorted(set(numeros))
+    if not numeros:
+        return []
+    sessao_propria = sessao is None
+    if sessao_propria:
+        sessao = criar_sessao(max_workers)
+    falhas = []
+
+    resultados = {}
     try:
-        ultimo_resp = requests.get(BASE_URL.format("latest"), headers=HEADERS, timeout=10)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Cada tarefa leva uma cópia do contexto: as requisições contam no coletor de quem chamou
+            futuros = {
+                executor.submit(
+                    contextvars.copy_context().run,
+                    fetch_concurso, n, sessao=sessao, base_url=base_url, controlador=controlador, falhas=falhas
+                ): n
+                for n in numeros
+            }
+            for feitos, futuro in enumerate(as_completed(futuros), 1):
+                resultados[futuros[futuro]] = futuro.result()
+                if ao_progredir:
+                    ao_progredir(feitos, len(numeros))
+    finally:
+        if sessao_propria:
+            sessao.close()
+
+    if falhas:
+        mensagem = resumir_falhas(falhas)
+        if avisos is not None:
+            avisos.append(mensagem)
+        else:
+            _streamlit().warning(mensagem)
+    return [resultados[n] for n in numeros if resultados[n]]
+
+def obter_ultimo_concurso(sessao=None, base_url=BASE_URL, padrao=ULTIMO_CONCURSO_CONHECIDO, controlador=None):
+    """Número do concurso mais recente segundo a API (ou `padrao` se ela não responder)."""
+    controlador = controlador if controlador is not None else CONTROLADOR
+    cliente = sessao if sessao is not None else requests
+    try:
+        controlador.adquirir()
+    except CircuitoAberto:
+        return padrao
+    inicio = perf_counter()
+    ultimo_resp = None
+    try:
+        ultimo_resp = cliente.get(base_url.format("latest"), headers=HEADERS, timeout=10)
         ultimo_resp.raise_for_status()
-        ultimo = ultimo_resp.json()["numero"]
+        ultimo = int(ultimo_resp.json()["numero"])
     except Exception:
+        ultimo = None
+    latencia = perf_counter() - inicio
+    status = ultimo_resp.status_code if ultimo_resp is not None else None
+    INSTRUMENTACAO.registrar_http(latencia, status, falha=ultimo is None)
+    if ultimo is None:
+        controlador.registrar_falha(status, _retry_after(ultimo_resp))
         # fallback manual
-        ultimo = 6740
+        return padrao
+    controlador.registrar_sucesso(latencia)
+    return ultimo
+
+def sincronizar_banco(conexao, ultimo=None, desde=None, ao_progredir=None, **kwargs):
+    """Baixa apenas os concursos que faltam no banco local até o `ultimo`.
+
+    Por padrão busca só os mais novos que o maior armazenado; com `desde`, também
+    preenche lacunas a partir desse concurso. Retorna quantos concursos foram gravados.
+    """
+    if ultimo is None:
+        ultimo = obter_ultimo_concurso()
+    existentes_max = maior_concurso(conexao)
+    ultimo = max(ultimo, existentes_max)
+    inicio = existentes_max + 1 if desde is None else max(1, desde)
+
+    faltantes = set(range(inicio, ultimo + 1)) - concursos_armazenados(conexao, inicio, ultimo)
+    INSTRUMENTACAO.registrar_cache(
+        'banco_local', acertos=max(0, ultimo - inicio + 1 - len(faltantes)), faltas=len(faltantes)
+    )
+    if not faltantes:
+        return 0
+    concursos = baixar_concursos(faltantes, ao_progredir=ao_progredir, **kwargs)
+    return salvar_concursos(conexao, concursos)
+
+def obter_concursos_ate(limit=2500):
+    st = _streamlit()
+    # Para pegar o último concurso da API Caixa (tentativa rápida)
+    ultimo = obter_ultimo_concurso()
 
     inicio = max(1, ultimo - limit + 1)
     st.info(f"Buscando concursos do {inicio} até o {ultimo}...")
 
-    for n in range(inicio, ultimo + 1):
-        resultado = fetch_concurso(n)
-        if resultado:
-            concursos.append(resultado)
-        sleep(0.15)  # evita sobrecarga
-
-    return pd.DataFrame(concursos)
+    progresso = st.progress(0)
+    conexao = abrir_banco()
+    try:
+        sincronizar_banco(
+            conexao, ultimo, desde=inicio,
+            ao_progredir=lambda feitos, total: progresso.progress(feitos / total)
+        )
+        return carregar_concursos(conexao, limit)
+    finally:
+        conexao.close()
 
 # ======================== STREAMLIT ===========================
 
-st.title("🔍 Coleta de Concursos da Quina")
+if __name__ == "__main__":
+    st = _streamlit()
+    obter_concursos_ate = st.cache_data(show_spinner="🔄 Carregando concursos da Quina...", ttl=3600)(
+        obter_concursos_ate
+    )
 
-quantidade_concursos = st.slider(
-    "Escolha a quantidade de concursos a carregar",
-    min_value=10, max_value=2500, value=500, step=10
-)
+    st.title("🔍 Coleta de Concursos da Quina")
+
+    quantidade_concursos = st.slider(
+        "Escolha a quantidade de concursos a carregar",
+        min_value=10, max_value=2500, value=500, step=10
+    )
 
-df_concursos = obter_concursos_ate(quantidade_concursos)
+    df_concursos = obter_concursos_ate(quantidade_concursos)
 
-st.success(f"{len(df_concursos)} concursos carregados com sucesso!")
-st.dataframe(df_concursos)
+    st.success(f"{len(df_concursos)} concursos carregados com sucesso!")
+    st.dataframe(df_concursos)
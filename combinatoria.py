@@ -0,0 +1,31 @@
+from math import comb
+
+import numpy as np
+
+from matriz_sorteios import TOTAL_DEZENAS, DEZENAS_POR_SORTEIO
+
+# BINOMIAIS[n, k] = C(n, k) para 0 <= n <= 80 e 0 <= k <= 5
+BINOMIAIS = np.array(
+    [[comb(n, k) for k in range(DEZENAS_POR_SORTEIO + 1)] for n in range(TOTAL_DEZENAS + 1)],
+    dtype=np.int64
+)
+
+def total_combinacoes(tamanho):
+    return int(BINOMIAIS[TOTAL_DEZENAS, tamanho])
+
+def ranquear(combinacoes):
+    """Posição de cada combinação (dezenas 1..80, em ordem crescente) no sistema numérico
+    combinatório (ordem colexicográfica): um inteiro em [0, C(80, t))."""
+    combinacoes = np.asarray(combinacoes, dtype=np.int64)
+    tamanho = combinacoes.shape[-1]
+    return BINOMIAIS[combinacoes - 1, np.arange(1, tamanho + 1)].sum(axis=-1)
+
+def desranquear(ranks, tamanho):
+    """Inverso de `ranquear`: devolve um array (..., tamanho) com as dezenas 1..80."""
+    restantes = np.array(ranks, dtype=np.int64, copy=True)
+    combinacoes = np.empty(restantes.shape + (tamanho,), dtype=np.int64)
+    for posicao in range(tamanho, 0, -1):
+        c = np.searchsorted(BINOMIAIS[:, posicao], restantes, side='right') - 1
+        combinacoes[..., posicao - 1] = c + 1
+        restantes -= BINOMIAIS[c, posicao]
+    return combinacoes
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from instrumentacao import instrumentado
+from matriz_sorteios import como_matriz
+
+FAIXAS_PREMIO = {2: 'duque', 3: 'terno', 4: 'quadra', 5: 'quina'}
+
+def popcount(valores):
+    """Quantidade de bits ligados em cada elemento de um array de inteiros sem sinal."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(valores)
+    # numpy < 2.0: conta os bits byte a byte
+    bytes_ = valores[..., None].view(np.uint8)
+    return np.unpackbits(bytes_, axis=-1).sum(axis=-1, dtype=np.uint8)
+
+def mascaras(dezenas):
+    """Codifica cada linha de dezenas (1..80) como uma máscara de 80 bits em dois `uint64`."""
+    dezenas = np.asarray(dezenas, dtype=np.uint64)
+    bits = dezenas - np.uint64(1)
+    baixa = np.where(bits < 64, np.uint64(1) << (bits % np.uint64(64)), np.uint64(0))
+    alta = np.where(bits >= 64, np.uint64(1) << (bits % np.uint64(64)), np.uint64(0))
+    return np.stack([np.bitwise_or.reduce(baixa, axis=-1), np.bitwise_or.reduce(alta, axis=-1)], axis=-1)
+
+def matriz_acertos(cartoes, sorteios):
+    """Matriz cartões × sorteios com a quantidade de acertos de cada cartão em cada sorteio."""
+    mascaras_cartoes = mascaras(cartoes)
+    mascaras_sorteios = mascaras(como_matriz(sorteios).dezenas)
+    baixa = popcount(mascaras_cartoes[:, None, 0] & mascaras_sorteios[None, :, 0])
+    alta = popcount(mascaras_cartoes[:, None, 1] & mascaras_sorteios[None, :, 1])
+    return (baixa + alta).astype(np.uint8)
+
+@instrumentado()
+def conferir_cartoes(cartoes, sorteios, tamanho_lote=2048):
+    """Confere todos os cartões contra todos os sorteios de uma vez.
+
+    Retorna dois DataFrames: prêmios (duque/terno/quadra/quina) por cartão e por concurso.
+    """
+    cartoes = np.sort(np.asarray(cartoes, dtype=np.int64).reshape(-1, 5), axis=1)
+    matriz = como_matriz(sorteios)
+
+    por_cartao = np.zeros((len(cartoes), len(FAIXAS_PREMIO)), dtype=np.int64)
+    por_concurso = np.zeros((len(matriz), len(FAIXAS_PREMIO)), dtype=np.int64)
+    for inicio in range(0, len(cartoes), tamanho_lote):
+        acertos = matriz_acertos(cartoes[inicio:inicio + tamanho_lote], matriz)
+        for coluna, qtd in enumerate(FAIXAS_PREMIO):
+            premiados = acertos == qtd
+            por_cartao[inicio:inicio + tamanho_lote, coluna] = premiados.sum(axis=1)
+            por_concurso[:, coluna] += premiados.sum(axis=0)
+
+    nomes = list(FAIXAS_PREMIO.values())
+    df_cartoes = pd.DataFrame(por_cartao, columns=nomes)
+    df_cartoes.insert(0, 'cartão', ["   ".join(f"{d:02d}" for d in c) for c in cartoes])
+    df_cartoes.index = pd.RangeIndex(1, len(cartoes) + 1)
+
+    df_concursos = pd.DataFrame(por_concurso, columns=nomes)
+    df_concursos.insert(0, 'concurso', matriz.concursos)
+    df_concursos.insert(1, 'data', matriz.datas)
+    df_concursos.insert(2, 'resultado', ["   ".join(f"{d:02d}" for d in s) for s in matriz.dezenas])
+    return df_cartoes, df_concursos
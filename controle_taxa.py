@@ -0,0 +1,129 @@
+"""Controle de taxa compartilhado para as requisições à API da Caixa.
+
+Um balde de fichas limita as requisições por segundo; a taxa cresce devagar enquanto
+as respostas chegam rápidas e cai pela metade a cada 429/5xx ou falha de rede
+(AIMD, como no controle de congestionamento do TCP). Falhas seguidas abrem um
+disjuntor que pausa todas as threads; se ele abre várias vezes sem nenhum sucesso
+no meio, `adquirir` passa a levantar `CircuitoAberto` para a coleta desistir logo.
+"""
+import random
+import threading
+import time
+
+class CircuitoAberto(Exception):
+    """A API está fora do ar (o disjuntor abriu repetidas vezes sem sucesso)."""
+
+def falha_da_api(status):
+    """Falhas que indicam sobrecarga ou indisponibilidade: 429, 5xx ou sem resposta."""
+    return status is None or status == 429 or status >= 500
+
+class ControladorTaxa:
+    def __init__(self, taxa_inicial=8.0, taxa_minima=0.5, taxa_maxima=40.0, passo=0.25,
+                 latencia_alvo=1.0, falhas_para_abrir=5, pausa_circuito=15.0, aberturas_max=3,
+                 espera_maxima=30.0, relogio=time.monotonic, dormir=time.sleep):
+        self.taxa = float(taxa_inicial)
+        self.taxa_minima = taxa_minima
+        self.taxa_maxima = taxa_maxima
+        self.passo = passo
+        self.latencia_alvo = latencia_alvo
+        self.falhas_para_abrir = falhas_para_abrir
+        self.pausa_circuito = pausa_circuito
+        self.aberturas_max = aberturas_max
+        self.espera_maxima = espera_maxima
+        self._relogio = relogio
+        self._dormir = dormir
+        self._trava = threading.Lock()
+
+        self._fichas = 1.0
+        self._atualizado_em = relogio()
+        self._liberado_em = 0.0  # Retry-After: ninguém sai antes disso
+        self._falhas_seguidas = 0
+        self._aberturas_seguidas = 0
+        self._aberto_ate = 0.0
+        self._sondando = False
+        self.contagem = {'sucessos': 0, 'falhas': 0, 'limitadas': 0, 'aberturas': 0}
+
+    @property
+    def estado(self):
+        with self._trava:
+            agora = self._relogio()
+            if agora < self._aberto_ate:
+                return 'aberto'
+            return 'meio-aberto' if self._falhas_seguidas >= self.falhas_para_abrir else 'fechado'
+
+    def _repor_fichas(self, agora):
+        self._fichas = min(max(1.0, self.taxa), self._fichas + (agora - self._atualizado_em) * self.taxa)
+        self._atualizado_em = agora
+
+    def adquirir(self):
+        """Bloqueia até a requisição poder sair. Levanta `CircuitoAberto` se a API parece fora do ar."""
+        while True:
+            with self._trava:
+                agora = self._relogio()
+                self._repor_fichas(agora)
+                if agora < self._aberto_ate:
+                    if self._aberturas_seguidas >= self.aberturas_max:
+                        raise CircuitoAberto("API indisponível: disjuntor aberto")
+                    espera = self._aberto_ate - agora
+                elif self._falhas_seguidas >= self.falhas_para_abrir and self._sondando:
+                    # Meio-aberto: só uma requisição de sondagem por vez
+                    espera = 0.05
+                elif agora < self._liberado_em:
+                    espera = self._liberado_em - agora
+                elif self._fichas >= 1:
+                    self._fichas -= 1
+                    if self._falhas_seguidas >= self.falhas_para_abrir:
+                        self._sondando = True
+                    return
+                else:
+                    espera = (1 - self._fichas) / self.taxa
+            self._dormir(espera)
+
+    def registrar_sucesso(self, latencia):
+        with self._trava:
+            self.contagem['sucessos'] += 1
+            self._falhas_seguidas = 0
+            self._aberturas_seguidas = 0
+            self._sondando = False
+            if latencia <= self.latencia_alvo:
+                self.taxa = min(self.taxa_maxima, self.taxa + self.passo)
+            else:
+                # Lentidão antes do erro: recua pouco
+                self.taxa = max(self.taxa_minima, self.taxa * 0.9)
+
+    def registrar_falha(self, status=None, retry_after=None):
+        """Registra uma falha (status HTTP ou None sem resposta). Erros 4xx do cliente não contam."""
+        with self._trava:
+            self.contagem['falhas'] += 1
+            # Qualquer desfecho libera a vaga de sondagem; um 4xx só não diz nada sobre a API
+            era_sondagem, self._sondando = self._sondando, False
+            if not falha_da_api(status):
+                return
+            agora = self._relogio()
+            if status == 429:
+                self.contagem['limitadas'] += 1
+            meio_aberto = self._falhas_seguidas >= self.falhas_para_abrir
+            # Requisições que já estavam em voo quando o disjuntor abriu: só contam
+            if agora < self._aberto_ate or (meio_aberto and not era_sondagem):
+                return
+
+            self.taxa = max(self.taxa_minima, self.taxa / 2)
+            self._fichas = 0.0
+            self._atualizado_em = agora
+            if retry_after:
+                self._liberado_em = max(self._liberado_em, agora + min(retry_after, self.espera_maxima))
+
+            self._falhas_seguidas += 1
+            # Abre ao passar de fechado para aberto ou quando a sondagem do meio-aberto falha
+            if self._falhas_seguidas >= self.falhas_para_abrir:
+                self._aberto_ate = agora + self.pausa_circuito
+                self._aberturas_seguidas += 1
+                self.contagem['aberturas'] += 1
+
+    def espera_retentativa(self, tentativa, base=0.3):
+        """Backoff exponencial com jitter completo: uniforme em [0, base·2^tentativa], com teto."""
+        return random.uniform(0, min(self.espera_maxima, base * 2 ** tentativa))
+
+    def resumo(self):
+        with self._trava:
+            return dict(self.contagem, taxa=round(self.taxa, 2))
@@ -0,0 +1,84 @@
+from itertools import combinations
+
+import numpy as np
+
+from combinatoria import desranquear, ranquear, total_combinacoes
+from matriz_sorteios import TOTAL_DEZENAS, DEZENAS_POR_SORTEIO, como_matriz
+
+# Posições (dentro de um sorteio ordenado) de cada par/trinca/quadra
+POSICOES_COMBINACOES = {
+    tamanho: np.array(list(combinations(range(DEZENAS_POR_SORTEIO), tamanho)))
+    for tamanho in (2, 3, 4)
+}
+
+class IndiceCoocorrencia:
+    """Contagens de co-ocorrência de pares, trincas e (opcionalmente) quadras.
+
+    `pares` é a matriz 80×80 simétrica (a diagonal guarda a frequência de cada dezena);
+    trincas e quadras ficam em vetores indexados pelo rank combinatório (ver `combinatoria`).
+    """
+
+    def __init__(self, incluir_quadras=False):
+        self.pares = np.zeros((TOTAL_DEZENAS, TOTAL_DEZENAS), dtype=np.int32)
+        self.contagens = {tamanho: np.zeros(total_combinacoes(tamanho), dtype=np.int32)
+                          for tamanho in ((2, 3, 4) if incluir_quadras else (2, 3))}
+        self.total_sorteios = 0
+
+    @classmethod
+    def de_sorteios(cls, dados, incluir_quadras=False):
+        """Monta o índice a partir de uma MatrizSorteios ou DataFrame com 'dezenas'."""
+        indice = cls(incluir_quadras)
+        indice.adicionar(como_matriz(dados).dezenas)
+        return indice
+
+    def _atualizar(self, dezenas, sinal):
+        dezenas = np.sort(np.asarray(dezenas, dtype=np.int64).reshape(-1, DEZENAS_POR_SORTEIO), axis=1)
+        for tamanho, contagem in self.contagens.items():
+            ranks = ranquear(dezenas[:, POSICOES_COMBINACOES[tamanho]]).ravel()
+            contagem += sinal * np.bincount(ranks, minlength=len(contagem)).astype(np.int32)
+
+        pares = dezenas[:, POSICOES_COMBINACOES[2]] - 1
+        celulas = np.bincount(pares[..., 0].ravel() * TOTAL_DEZENAS + pares[..., 1].ravel(),
+                              minlength=TOTAL_DEZENAS ** 2).reshape(TOTAL_DEZENAS, TOTAL_DEZENAS)
+        frequencia = np.bincount(dezenas.ravel() - 1, minlength=TOTAL_DEZENAS)
+        self.pares += sinal * (celulas + celulas.T + np.diag(frequencia)).astype(np.int32)
+        self.total_sorteios += sinal * len(dezenas)
+
+    def adicionar(self, dezenas):
+        """Acrescenta um sorteio (5 dezenas) ou um lote N×5 ao índice."""
+        self._atualizar(dezenas, 1)
+
+    def remover(self, dezenas):
+        """Desfaz `adicionar` para um sorteio ou lote N×5."""
+        self._atualizar(dezenas, -1)
+
+    def contagem(self, combinacao):
+        """Quantas vezes a combinação (par, trinca ou quadra) saiu junta."""
+        combinacao = sorted(combinacao)
+        if len(combinacao) not in self.contagens:
+            raise ValueError(f"Índice não contém combinações de tamanho {len(combinacao)}")
+        return int(self.contagens[len(combinacao)][ranquear(combinacao)])
+
+    def mais_comuns(self, tamanho=2, top=10):
+        """As `top` combinações mais frequentes como [((d1, d2, ...), contagem), ...].
+
+        Empates são desfeitos pela ordem crescente das dezenas.
+        """
+        if tamanho not in self.contagens:
+            raise ValueError(f"Índice não contém combinações de tamanho {tamanho}")
+        contagem = self.contagens[tamanho]
+        top = min(top, len(contagem))
+        if top <= 0:
+            return []
+        limiar = max(contagem[np.argpartition(contagem, -top)[-top:]].min(), 1)
+        candidatos = np.flatnonzero(contagem >= limiar)
+        combos = desranquear(candidatos, tamanho)
+        ordem = np.lexsort(tuple(combos.T[::-1]) + (-contagem[candidatos],))[:top]
+        return [(tuple(int(d) for d in combos[i]), int(contagem[candidatos[i]])) for i in ordem]
+
+    def melhores_parceiros(self, dezena, top=10):
+        """Dezenas que mais saíram junto com `dezena`, como [(parceira, contagem), ...]."""
+        linha = self.pares[dezena - 1].copy()
+        linha[dezena - 1] = -1
+        ordem = np.argsort(-linha, kind='stable')[:top]
+        return [(int(i) + 1, int(linha[i])) for i in ordem if linha[i] > 0]
@@ -1,40 +1,41 @@
-def calcular_estatisticas(df):
-    df = df.copy()
-    df['soma'] = df['dezenas'].apply(sum)
+import numpy as np
 
-    # Pares e ímpares
-    df['pares'] = df['dezenas'].apply(lambda d: sum(1 for x in d if x % 2 == 0))
-    df['ímpares'] = df['dezenas'].apply(lambda d: sum(1 for x in d if x % 2 != 0))
+from instrumentacao import instrumentado
+from matriz_sorteios import MatrizSorteios, como_matriz
 
-    # Quadrantes
-    def quadrantes(dezenas):
-        q = [0, 0, 0, 0]
-        for n in dezenas:
-            if 1 <= n <= 20:
-                q[0] += 1
-            elif 21 <= n <= 40:
-                q[1] += 1
-            elif 41 <= n <= 60:
-                q[2] += 1
-            elif 61 <= n <= 80:
-                q[3] += 1
-        return q
+def contar_repetidas(matriz, k=1):
+    """Quantas dezenas de cada sorteio já tinham saído no sorteio `k` concursos antes.
 
-    quadrantes_split = df['dezenas'].apply(quadrantes)
-    df[['q1', 'q2', 'q3', 'q4']] = pd.DataFrame(quadrantes_split.tolist(), index=df.index)
+    As `k` primeiras linhas, que não têm com quem comparar, ficam com 0.
+    """
+    if k < 1:
+        raise ValueError("k deve ser pelo menos 1")
+    incidencia = como_matriz(matriz).incidencia
+    repetidas = np.zeros(len(incidencia), dtype=np.int64)
+    if len(incidencia) > k:
+        repetidas[k:] = (incidencia[k:] & incidencia[:-k]).sum(axis=1)
+    return repetidas
 
-    # Repetidas do concurso anterior
-    repetidas = [0]
-    for i in range(1, len(df)):
-        atual = set(df.loc[i, 'dezenas'])
-        anterior = set(df.loc[i - 1, 'dezenas'])
-        repetidas.append(len(atual & anterior))
-    df['repetidas'] = repetidas
+@instrumentado()
+def calcular_estatisticas(df, k=1):
+    matriz = como_matriz(df)
+    df = matriz.para_dataframe() if isinstance(df, MatrizSorteios) else df
+    dezenas = matriz.dezenas.astype(np.int64)
 
-    return df
+    # Pares e ímpares
+    pares = (dezenas % 2 == 0).sum(axis=1)
 
-# Aplicar as estatísticas
-df_estatisticas = calcular_estatisticas(df_concursos)
+    # Quadrantes (1-20, 21-40, 41-60, 61-80)
+    quadrantes = matriz.incidencia.reshape(len(matriz), 4, 20).sum(axis=2)
 
-# Exibir as 5 primeiras linhas
-print(df_estatisticas[['concurso', 'soma', 'pares', 'ímpares', 'repetidas', 'q1', 'q2', 'q3', 'q4']].head())
+    return df.assign(**{
+        'soma': dezenas.sum(axis=1),
+        'pares': pares,
+        'ímpares': dezenas.shape[1] - pares,
+        'q1': quadrantes[:, 0],
+        'q2': quadrantes[:, 1],
+        'q3': quadrantes[:, 2],
+        'q4': quadrantes[:, 3],
+        # Repetidas do concurso `k` posições antes (por padrão, o anterior)
+        'repetidas': contar_repetidas(matriz, k),
+    })
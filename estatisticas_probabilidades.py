@@ -1,30 +1,9 @@
-import random
-from collections import Counter
+import numpy as np
 
-def estatisticas_agregadas(df):
-    resumo = {}
+from agregados import estatisticas_agregadas  # noqa: F401 (reexportada)
+from indice_invertido import IndiceInvertido
 
-    # Faixas numéricas
-    for faixa in ['faixa_baixa', 'faixa_media', 'faixa_alta']:
-        resumo[faixa + '_média'] = df[faixa].mean()
-        resumo[faixa + '_mais_comum'] = df[faixa].mode()[0]
-
-    # Média e amplitude
-    resumo['média_geral'] = df['media'].mean()
-    resumo['amplitude_média'] = df['amplitude'].mean()
-
-    # Sequências consecutivas
-    resumo['sequências_média'] = df['sequencias'].mean()
-    resumo['sequências_max'] = df['sequencias'].max()
-
-    # Linhas e colunas mais comuns
-    linha_soma = df[[f'linha_{i}' for i in range(1, 9)]].sum()
-    coluna_soma = df[[f'col_{i}' for i in range(10)]].sum()
-
-    resumo['linha_mais_frequente'] = linha_soma.idxmax()
-    resumo['coluna_mais_frequente'] = coluna_soma.idxmax()
-
-    return resumo
+COLUNAS_SIMILARES = ['concurso', 'dezenas', 'media', 'amplitude', 'sequencias']
 
 def classificar_cartao(cartao, resumo):
     cartao = sorted(cartao)
@@ -50,22 +29,83 @@ def classificar_cartao(cartao, resumo):
     status = "bom" if score >= 2 else "ruim"
     return {"pontuação": score, "status": status}
 
-def comparar_com_padroes(cartao, df_padroes):
-    cartao_set = set(cartao)
-    similares = df_padroes[df_padroes['dezenas'].apply(lambda x: len(cartao_set & set(x)) >= 4)]
-    return similares[['concurso', 'dezenas', 'media', 'amplitude', 'sequencias']]
-
-def gerar_cartao_inteligente(resumo, tentativas=1000):
-    melhores = []
-
-    for _ in range(tentativas):
-        cartao = sorted(random.sample(range(1, 81), 5))
-        classificacao = classificar_cartao(cartao, resumo)
-        if classificacao['status'] == 'bom':
-            melhores.append((cartao, classificacao['pontuação']))
-    
-    melhores.sort(key=lambda x: x[1], reverse=True)
-    return melhores[:5]  # Top 5 melhores cartões
+def comparar_com_padroes(cartao, df_padroes, minimo=4, indice=None):
+    """Concursos que têm pelo menos `minimo` dezenas em comum com o cartão.
+
+    Passe um `IndiceInvertido(df_padroes)` em `indice` para reaproveitá-lo entre consultas.
+    """
+    indice = indice if indice is not None else IndiceInvertido(df_padroes)
+    linhas = indice.posicoes(indice.compartilhando(sorted(set(cartao)), minimo)[0])
+    return df_padroes.iloc[linhas][COLUNAS_SIMILARES]
+
+def comparar_cartoes_com_padroes(cartoes, df_padroes, minimo=4, indice=None):
+    """Versão em lote de `comparar_com_padroes` para um array M×n de cartões.
+
+    Retorna as linhas semelhantes de todos os cartões juntas, com a coluna 'cartão'
+    (1..M) indicando a que cartão cada uma pertence.
+    """
+    indice = indice if indice is not None else IndiceInvertido(df_padroes)
+    numeros_cartoes, linhas = indice.posicoes_lote(indice.compartilhando(np.asarray(cartoes), minimo))
+    similares = df_padroes.iloc[linhas][COLUNAS_SIMILARES]
+    similares.insert(0, 'cartão', numeros_cartoes + 1)
+    return similares
+
+def amostrar_cartoes(quantidade, rng=None, dezenas=None):
+    """Sorteia `quantidade` cartões uniformes (M×5, dezenas distintas e ordenadas).
+
+    Com `dezenas`, os cartões são sorteados só entre elas (padrão: 1 a 80).
+    """
+    rng = np.random.default_rng(rng)
+    universo = np.arange(1, 81) if dezenas is None else np.unique(np.asarray(dezenas, dtype=np.int64))
+    if len(universo) < 5:
+        raise ValueError("São necessárias pelo menos 5 dezenas distintas")
+    # Índices no universo ordenado: ordenar os índices já deixa as dezenas em ordem
+    cartoes = rng.integers(0, len(universo), size=(quantidade, 5), dtype=np.int64)
+    cartoes.sort(axis=1)
+    repetidos = np.flatnonzero((np.diff(cartoes, axis=1) == 0).any(axis=1))
+    while len(repetidos):
+        novos = rng.integers(0, len(universo), size=(len(repetidos), 5), dtype=np.int64)
+        novos.sort(axis=1)
+        cartoes[repetidos] = novos
+        repetidos = repetidos[(np.diff(novos, axis=1) == 0).any(axis=1)]
+    return universo[cartoes]
+
+def classificar_cartoes(cartoes, resumo):
+    """Versão vetorizada de `classificar_cartao`: pontuação de cada linha de um array M×5."""
+    cartoes = np.sort(np.asarray(cartoes, dtype=np.int64), axis=1)
+    media = cartoes.sum(axis=1) / cartoes.shape[1]
+    amplitude = cartoes[:, -1] - cartoes[:, 0]
+    sequencias = (np.diff(cartoes, axis=1) == 1).sum(axis=1)
+    baixa = (cartoes <= 26).sum(axis=1)
+
+    score = np.where(np.abs(media - resumo['média_geral']) <= 5, 1, -1)
+    score += np.where(np.abs(amplitude - resumo['amplitude_média']) <= 10, 1, -1)
+    score += baixa == resumo['faixa_baixa_mais_comum']
+    score += np.where(sequencias <= resumo['sequências_max'], 1, -1)
+    return score
+
+def gerar_cartoes_pontuados(resumo, tentativas=1000, top=5, rng=None, tamanho_lote=1_000_000):
+    """Gera `tentativas` cartões aleatórios em lotes e devolve os `top` melhores "bons".
+
+    Retorna (cartões M×5, pontuações); empates mantêm a ordem em que foram gerados.
+    """
+    rng = np.random.default_rng(rng)
+    melhores = np.empty((0, 5), dtype=np.int64)
+    pontuacoes = np.empty(0, dtype=np.int64)
+    for inicio in range(0, tentativas, tamanho_lote):
+        cartoes = amostrar_cartoes(min(tamanho_lote, tentativas - inicio), rng)
+        score = classificar_cartoes(cartoes, resumo)
+        bons = score >= 2
+
+        melhores = np.concatenate([melhores, cartoes[bons]])
+        pontuacoes = np.concatenate([pontuacoes, score[bons]])
+        ordem = np.argsort(-pontuacoes, kind='stable')[:top]
+        melhores, pontuacoes = melhores[ordem], pontuacoes[ordem]
+    return melhores, pontuacoes
+
+def gerar_cartao_inteligente(resumo, tentativas=1000, top=5, rng=None):
+    cartoes, pontuacoes = gerar_cartoes_pontuados(resumo, tentativas, top, rng)
+    return [(cartao, int(p)) for cartao, p in zip(cartoes.tolist(), pontuacoes)]  # Top N melhores cartões
 
 def conferir_aposta(cartao, dezenas_sorteadas):
     acertos = len(set(cartao) & set(dezenas_sorteadas))
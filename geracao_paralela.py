@@ -0,0 +1,167 @@
+"""Geração reprodutível de muitos cartões distintos, em paralelo e gravada em disco.
+
+Cada tarefa sorteia um bloco de cartões com seu próprio gerador, derivado da semente
+com SeedSequence.spawn, e os blocos são consumidos na ordem das tarefas: a mesma
+semente dá os mesmos cartões, na mesma ordem, com qualquer número de processos.
+
+Os cartões são guardados pelo rank colexicográfico (`combinatoria.ranquear`), que cabe
+em 4 bytes, e as repetições são descartadas com um vetor de "já visto" para os
+C(80, 5) ranks possíveis, então a memória não cresce com a quantidade gerada.
+
+Exemplo:
+    python geracao_paralela.py 5000000 --semente 42 --saida cartoes.npy
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+
+import numpy as np
+
+from combinatoria import desranquear, ranquear, total_combinacoes
+from estatisticas_probabilidades import amostrar_cartoes, classificar_cartoes
+from instrumentacao import instrumentado
+from matriz_sorteios import DEZENAS_POR_SORTEIO
+
+TIPO_RANK = np.dtype('<u4')
+# Cartões sorteados por tarefa. Faz parte da sequência gerada: mudá-lo muda os cartões
+# de uma mesma semente, por isso é o mesmo em `gerar_cartoes` e `gravar_cartoes`
+CARTOES_POR_TAREFA = 100_000
+
+def _gerar_tarefa(semente, quantidade, dezenas, resumo, pontuacao_minima):
+    """Ranks dos cartões de uma tarefa, sem repetições e na ordem em que foram sorteados."""
+    cartoes = amostrar_cartoes(quantidade, np.random.default_rng(semente), dezenas)
+    if resumo is not None:
+        cartoes = cartoes[classificar_cartoes(cartoes, resumo) >= pontuacao_minima]
+    ranks = ranquear(cartoes).astype(TIPO_RANK)
+    _, primeiros = np.unique(ranks, return_index=True)
+    return ranks[np.sort(primeiros)]
+
+def _lotes_distintos(quantidade, semente, dezenas, resumo, pontuacao_minima, processos, cartoes_por_tarefa):
+    """Gera blocos de ranks inéditos, em ordem, até somar `quantidade` cartões."""
+    raiz = np.random.SeedSequence(semente)
+    visto = np.zeros(total_combinacoes(DEZENAS_POR_SORTEIO), dtype=bool)
+    constantes = (cartoes_por_tarefa, dezenas, resumo, pontuacao_minima)
+
+    executor = ProcessPoolExecutor(max_workers=processos) if processos > 1 else None
+    mapear = executor.map if executor is not None else map
+    try:
+        faltam = quantidade
+        while faltam:
+            # Rodadas de algumas tarefas por processo: só elas ficam na memória ao mesmo tempo.
+            # SeedSequence.spawn continua a numeração, então as sementes não dependem das rodadas.
+            sementes = raiz.spawn(2 * processos)
+            blocos = mapear(_gerar_tarefa, sementes, *([valor] * len(sementes) for valor in constantes))
+            novos_na_rodada = 0
+            for ranks in blocos:
+                ineditos = ranks[~visto[ranks]][:faltam]
+                visto[ineditos] = True
+                faltam -= len(ineditos)
+                novos_na_rodada += len(ineditos)
+                if len(ineditos):
+                    yield ineditos
+                if not faltam:
+                    break
+            if not novos_na_rodada:
+                raise RuntimeError(f"Não há cartões distintos suficientes: faltaram {faltam} de {quantidade}")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+def _validar(quantidade, dezenas, processos):
+    universo = 80 if dezenas is None else len(np.unique(dezenas))
+    if quantidade > comb(universo, DEZENAS_POR_SORTEIO):
+        raise ValueError(f"Só existem {comb(universo, DEZENAS_POR_SORTEIO)} cartões distintos "
+                         f"com {universo} dezenas")
+    return processos or os.cpu_count() or 1
+
+@instrumentado()
+def gerar_cartoes(quantidade, semente=None, dezenas=None, resumo=None, pontuacao_minima=2,
+                  processos=1, cartoes_por_tarefa=CARTOES_POR_TAREFA):
+    """`quantidade` cartões distintos (M×5) sorteados entre `dezenas` (padrão: 1 a 80).
+
+    Com `resumo` (de `estatisticas_agregadas`), só entram cartões com pontuação de
+    `classificar_cartoes` >= `pontuacao_minima`. A mesma semente e os mesmos parâmetros
+    dão sempre os mesmos cartões, qualquer que seja `processos`, aqui ou em `gravar_cartoes`.
+    """
+    processos = _validar(quantidade, dezenas, processos)
+    blocos = list(_lotes_distintos(quantidade, semente, dezenas, resumo, pontuacao_minima,
+                                   processos, cartoes_por_tarefa))
+    ranks = np.concatenate(blocos) if blocos else np.empty(0, dtype=TIPO_RANK)
+    return desranquear(ranks, DEZENAS_POR_SORTEIO)
+
+@instrumentado()
+def gravar_cartoes(caminho, quantidade, semente=None, dezenas=None, resumo=None, pontuacao_minima=2,
+                   processos=None, cartoes_por_tarefa=CARTOES_POR_TAREFA):
+    """Como `gerar_cartoes`, mas grava os ranks num .npy (uint32) à medida que são gerados.
+
+    O arquivo é mapeado em memória, então milhões de cartões não passam todos pela RAM.
+    Leia de volta com `ler_cartoes`. Retorna o caminho gravado.
+    """
+    processos = _validar(quantidade, dezenas, processos)
+    saida = np.lib.format.open_memmap(caminho, mode='w+', dtype=TIPO_RANK, shape=(quantidade,))
+    try:
+        posicao = 0
+        for ranks in _lotes_distintos(quantidade, semente, dezenas, resumo, pontuacao_minima,
+                                      processos, cartoes_por_tarefa):
+            saida[posicao:posicao + len(ranks)] = ranks
+            posicao += len(ranks)
+        saida.flush()
+    except BaseException:
+        del saida
+        os.remove(caminho)
+        raise
+    del saida
+    return caminho
+
+def ler_cartoes(caminho, inicio=0, fim=None):
+    """Cartões [inicio, fim) de um arquivo gravado por `gravar_cartoes`, como array M×5."""
+    ranks = np.load(caminho, mmap_mode='r')
+    return desranquear(np.asarray(ranks[inicio:fim], dtype=np.int64), DEZENAS_POR_SORTEIO)
+
+def _resumo_do_banco(caminho_banco):
+    from agregados import estatisticas_agregadas
+    from armazenamento import abrir_banco, carregar_concursos
+    from estatisticas_basicas import calcular_estatisticas
+    from padroes_ocultos import analisar_padroes_ocultos
+
+    conexao = abrir_banco(caminho_banco)
+    try:
+        df = carregar_concursos(conexao)
+    finally:
+        conexao.close()
+    if df.empty:
+        return None
+    return estatisticas_agregadas(analisar_padroes_ocultos(calcular_estatisticas(df)))
+
+def main(argv=None):
+    from armazenamento import CAMINHO_BANCO
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('quantidade', type=int, help="quantos cartões distintos gerar")
+    parser.add_argument('--saida', default='cartoes.npy', help="arquivo .npy com os ranks dos cartões")
+    parser.add_argument('--semente', type=int, help="semente do gerador (sem ela, cada execução é diferente)")
+    parser.add_argument('--processos', type=int, help="processos em paralelo (padrão: todos os núcleos)")
+    parser.add_argument('--dezenas', type=int, nargs='+', help="sorteia só entre estas dezenas")
+    parser.add_argument('--filtrar', action='store_true',
+                        help="mantém só os cartões bem pontuados frente ao histórico do banco")
+    parser.add_argument('--banco', default=str(CAMINHO_BANCO), help="banco SQLite de concursos (com --filtrar)")
+    args = parser.parse_args(argv)
+
+    resumo = None
+    if args.filtrar:
+        resumo = _resumo_do_banco(args.banco)
+        if resumo is None:
+            print("Nenhum concurso no banco para filtrar os cartões.", file=sys.stderr)
+            return 1
+    try:
+        gravar_cartoes(args.saida, args.quantidade, args.semente, args.dezenas, resumo, processos=args.processos)
+    except (ValueError, RuntimeError) as erro:
+        print(erro, file=sys.stderr)
+        return 1
+    print(args.saida)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
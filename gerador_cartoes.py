@@ -1,7 +1,9 @@
 import random
 import pandas as pd
 
-def gerar_cartoes_inteligentes(df_analisado, quantidade=5):
+def gerar_cartoes_inteligentes(df_analisado, quantidade=5, semente=None):
+    # Gerador próprio: com a mesma semente, os mesmos cartões
+    rng = random.Random(semente)
     cartoes = []
 
     # 1. Frequência das dezenas
@@ -27,20 +29,20 @@ def gerar_cartoes_inteligentes(df_analisado, quantidade=5):
         cartao = set()
 
         # Escolher 2 dezenas das mais frequentes
-        cartao.update(random.sample(dezenas_mais_frequentes, 2))
+        cartao.update(rng.sample(dezenas_mais_frequentes, 2))
 
         # Escolher 1 de coluna e 1 de linha mais frequentes
-        cartao.add(random.choice(colunas_top_numeros))
-        cartao.add(random.choice(linhas_top_numeros))
+        cartao.add(rng.choice(colunas_top_numeros))
+        cartao.add(rng.choice(linhas_top_numeros))
 
         # Garantir uma distribuição entre as faixas
-        cartao.add(random.choice(faixa_baixa))
-        cartao.add(random.choice(faixa_media))
-        cartao.add(random.choice(faixa_alta))
+        cartao.add(rng.choice(faixa_baixa))
+        cartao.add(rng.choice(faixa_media))
+        cartao.add(rng.choice(faixa_alta))
 
         # Completar com dezenas aleatórias não repetidas até chegar a 5
         while len(cartao) < 5:
-            candidato = random.randint(1, 80)
+            candidato = rng.randint(1, 80)
             cartao.add(candidato)
 
         cartoes.append(sorted(cartao))
@@ -0,0 +1,226 @@
+"""Importação em lote do arquivo oficial com todos os resultados da Quina.
+
+A Caixa publica o histórico completo como planilha (Quina.xlsx) ou, no formato antigo,
+como uma página HTML (D_QUINA.HTM). O arquivo é lido em fluxo, validado e gravado no
+banco local de uma vez; a API fica só com os concursos mais novos que o arquivo.
+
+Exemplo:
+    python importacao.py ~/Downloads/Quina.xlsx
+"""
+import argparse
+import csv
+import re
+import unicodedata
+from datetime import date, datetime
+from html.parser import HTMLParser
+from pathlib import Path
+
+from armazenamento import CAMINHO_BANCO, abrir_banco, concursos_armazenados, maior_concurso, salvar_concursos
+from matriz_sorteios import DEZENAS_POR_SORTEIO, TOTAL_DEZENAS
+
+DIRETORIO_DADOS = Path(__file__).with_name("dados")
+# Nomes com que o arquivo costuma ser baixado do site da Caixa
+ARQUIVOS_RESULTADOS = ("Quina.xlsx", "D_QUINA.HTM", "d_quina.htm")
+# Abaixo disso, vale mais a pena baixar os concursos pela API do que ler o arquivo inteiro
+MINIMO_PARA_IMPORTAR = 50
+
+_COLUNA_DEZENA = re.compile(r"^(bola\s*\d|\d.*dezena|dezena\s*\d)")
+
+class _LeitorTabelaHTML(HTMLParser):
+    """Junta as células de cada <tr>; as linhas prontas ficam em `linhas` até serem consumidas."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.linhas = []
+        self._linha = None
+        self._celula = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._linha = []
+        elif tag in ("td", "th") and self._linha is not None:
+            self._celula = []
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th") and self._celula is not None:
+            self._linha.append(" ".join("".join(self._celula).split()))
+            self._celula = None
+        elif tag == "tr" and self._linha is not None:
+            self.linhas.append(self._linha)
+            self._linha = None
+
+    def handle_data(self, data):
+        if self._celula is not None:
+            self._celula.append(data)
+
+def _linhas_html(caminho, tamanho_bloco=1 << 16):
+    leitor = _LeitorTabelaHTML()
+    # latin-1 nunca falha; só dígitos e cabeçalhos ASCII importam
+    with open(caminho, encoding="latin-1") as arquivo:
+        while bloco := arquivo.read(tamanho_bloco):
+            leitor.feed(bloco)
+            yield from leitor.linhas
+            leitor.linhas.clear()
+    leitor.close()
+    yield from leitor.linhas
+
+def _linhas_xlsx(caminho):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as erro:
+        raise ImportError("Ler planilhas .xlsx requer o pacote openpyxl (pip install openpyxl).") from erro
+    planilha = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        yield from planilha.active.iter_rows(values_only=True)
+    finally:
+        planilha.close()
+
+def _linhas_csv(caminho):
+    with open(caminho, encoding="utf-8-sig", newline="") as arquivo:
+        dialeto = csv.Sniffer().sniff(arquivo.read(4096), delimiters=";,\t")
+        arquivo.seek(0)
+        yield from csv.reader(arquivo, dialeto)
+
+def ler_linhas(caminho):
+    """Linhas (listas de células) do arquivo, conforme a extensão: .htm/.html, .xlsx ou .csv."""
+    extensao = Path(caminho).suffix.lower()
+    if extensao in (".htm", ".html"):
+        return _linhas_html(caminho)
+    if extensao == ".xlsx":
+        return _linhas_xlsx(caminho)
+    if extensao == ".csv":
+        return _linhas_csv(caminho)
+    raise ValueError(f"Formato de arquivo não suportado: {extensao}")
+
+def _normalizar(texto):
+    texto = unicodedata.normalize("NFKD", str(texto or ""))
+    return "".join(c for c in texto if not unicodedata.combining(c)).strip().lower()
+
+def _localizar_colunas(cabecalho):
+    """Posições de concurso, data e das 5 dezenas num cabeçalho; None se não for o cabeçalho."""
+    nomes = [_normalizar(celula) for celula in cabecalho]
+    if "concurso" not in nomes:
+        return None
+    dezenas = [i for i, nome in enumerate(nomes) if _COLUNA_DEZENA.match(nome)][:DEZENAS_POR_SORTEIO]
+    datas = [i for i, nome in enumerate(nomes) if nome.startswith("data")]
+    if len(dezenas) < DEZENAS_POR_SORTEIO or not datas:
+        raise ValueError(f"Cabeçalho sem as colunas esperadas: {list(cabecalho)}")
+    return nomes.index("concurso"), datas[0], dezenas
+
+def _inteiro(valor):
+    if isinstance(valor, (int, float)):
+        return int(valor)
+    texto = str(valor or "").strip()
+    return int(texto) if texto.isdigit() else None
+
+def _formatar_data(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.strftime("%d/%m/%Y")
+    return str(valor).strip()
+
+def ler_resultados(caminho):
+    """Gera {'concurso', 'data', 'dezenas'} para cada concurso do arquivo, validando cada um.
+
+    Linhas sem número de concurso (ex.: as cidades dos ganhadores no HTML antigo) são
+    ignoradas. Levanta ValueError para dezenas fora de 1–80 ou repetidas e para concursos
+    fora de ordem.
+    """
+    colunas = None
+    anterior = 0
+    for numero_linha, linha in enumerate(ler_linhas(caminho), 1):
+        linha = list(linha)
+        if colunas is None:
+            colunas = _localizar_colunas(linha)
+            continue
+        pos_concurso, pos_data, pos_dezenas = colunas
+        if len(linha) <= max(pos_concurso, pos_data, *pos_dezenas):
+            continue
+        concurso = _inteiro(linha[pos_concurso])
+        if concurso is None:
+            continue
+
+        dezenas = [_inteiro(linha[i]) for i in pos_dezenas]
+        if any(d is None or not 1 <= d <= TOTAL_DEZENAS for d in dezenas) or len(set(dezenas)) != len(dezenas):
+            raise ValueError(f"Linha {numero_linha}: dezenas inválidas no concurso {concurso}: {dezenas}")
+        if concurso <= anterior:
+            raise ValueError(f"Linha {numero_linha}: concurso {concurso} fora de ordem (depois do {anterior})")
+        anterior = concurso
+        yield {"concurso": concurso, "data": _formatar_data(linha[pos_data]), "dezenas": sorted(dezenas)}
+
+    if colunas is None:
+        raise ValueError(f"Nenhuma tabela de resultados encontrada em {caminho}")
+
+def importar_resultados(conexao, caminho, tamanho_lote=1000):
+    """Lê o arquivo em fluxo e grava os concursos no banco, em lotes.
+
+    Retorna {'importados', 'primeiro', 'ultimo', 'lacunas'}, onde `lacunas` lista os
+    concursos que faltam entre o primeiro e o último do arquivo. Se a validação falhar
+    no meio, os lotes anteriores (já validados) continuam gravados.
+    """
+    lote, lacunas = [], []
+    importados, primeiro, ultimo = 0, None, None
+    for resultado in ler_resultados(caminho):
+        concurso = resultado["concurso"]
+        if ultimo is not None and concurso > ultimo + 1:
+            lacunas.extend(range(ultimo + 1, concurso))
+        primeiro = concurso if primeiro is None else primeiro
+        ultimo = concurso
+        lote.append(resultado)
+        if len(lote) >= tamanho_lote:
+            importados += salvar_concursos(conexao, lote)
+            lote = []
+    importados += salvar_concursos(conexao, lote)
+    return {"importados": importados, "primeiro": primeiro, "ultimo": ultimo, "lacunas": lacunas}
+
+def arquivo_de_resultados(diretorio=DIRETORIO_DADOS):
+    """Caminho do arquivo oficial salvo em `diretorio`, se houver."""
+    for nome in ARQUIVOS_RESULTADOS:
+        caminho = Path(diretorio) / nome
+        if caminho.exists():
+            return caminho
+    return None
+
+def preencher_com_arquivo(conexao, inicio, fim, caminho=None, minimo=MINIMO_PARA_IMPORTAR):
+    """Importa o arquivo oficial se faltarem pelo menos `minimo` concursos em [inicio, fim].
+
+    Retorna quantos concursos foram importados (0 se não havia arquivo ou não valia a pena).
+    """
+    caminho = caminho or arquivo_de_resultados()
+    if caminho is None:
+        return 0
+    faltantes = (fim - inicio + 1) - len(concursos_armazenados(conexao, inicio, fim))
+    if faltantes < minimo:
+        return 0
+    return importar_resultados(conexao, caminho)["importados"]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("arquivo", help="arquivo de resultados da Caixa (.xlsx, .htm ou .csv)")
+    parser.add_argument("--banco", default=str(CAMINHO_BANCO), help="banco SQLite de concursos")
+    parser.add_argument("--sem-api", action="store_true",
+                        help="não busca na API os concursos mais novos que o arquivo")
+    args = parser.parse_args(argv)
+
+    conexao = abrir_banco(args.banco)
+    try:
+        resultado = importar_resultados(conexao, args.arquivo)
+        print(f"{resultado['importados']} concursos importados "
+              f"({resultado['primeiro']} a {resultado['ultimo']}).")
+        if resultado["lacunas"]:
+            print(f"Faltam no arquivo {len(resultado['lacunas'])} concursos: {resultado['lacunas'][:20]}")
+        if not args.sem_api:
+            from coleta_dados import sincronizar_banco
+
+            # Começa na primeira lacuna do arquivo, se houver; senão, só o que é mais novo que ele
+            avisos = []
+            desde = resultado["lacunas"][0] if resultado["lacunas"] else None
+            novos = sincronizar_banco(conexao, desde=desde, avisos=avisos)
+            for aviso in avisos:
+                print(aviso)
+            print(f"{novos} concursos baixados da API (banco até o {maior_concurso(conexao)}).")
+    finally:
+        conexao.close()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
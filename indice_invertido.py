@@ -0,0 +1,75 @@
+"""Índice invertido dos sorteios: para cada dezena, o conjunto de concursos em que ela saiu.
+
+Cada lista de ocorrências é um bitset (bit i ↔ i-ésima linha do histórico) em palavras
+`uint64`, então "concursos com este par/trinca" é um AND e "concursos com pelo menos k
+destas dezenas" é um OR de ANDs, tudo sobre ~N/64 palavras por dezena.
+"""
+from itertools import combinations
+
+import numpy as np
+
+from conferencia import popcount
+from matriz_sorteios import TOTAL_DEZENAS, como_matriz
+
+class IndiceInvertido:
+    def __init__(self, dados):
+        matriz = como_matriz(dados)
+        self.concursos = matriz.concursos
+        self.total_sorteios = len(matriz)
+        palavras = -(-len(matriz) // 64)
+
+        # Linha 0 vazia para indexar direto pela dezena (1..80)
+        bits = np.zeros((TOTAL_DEZENAS + 1, palavras * 64), dtype=bool)
+        bits[1:, :len(matriz)] = matriz.incidencia.T
+        self.ocorrencias = np.packbits(bits, axis=1, bitorder='little').view('<u8')
+        self.todos = np.bitwise_or.reduce(self.ocorrencias, axis=0)
+
+    def contendo(self, dezenas):
+        """Bitset dos concursos que contêm todas as `dezenas` (ex.: um par ou uma trinca)."""
+        dezenas = np.asarray(dezenas, dtype=np.intp)
+        if dezenas.size == 0:
+            return self.todos.copy()
+        return np.bitwise_and.reduce(self.ocorrencias[dezenas], axis=0)
+
+    def compartilhando(self, cartoes, minimo=4, tamanho_lote=4096):
+        """Bitsets (M×palavras) dos concursos com pelo menos `minimo` dezenas de cada cartão.
+
+        `cartoes` é um array M×n (ou um único cartão); cada cartão vira um OR, sobre as
+        C(n, minimo) combinações de dezenas, do AND das listas de ocorrências.
+        """
+        cartoes = np.asarray(cartoes, dtype=np.intp)
+        cartoes = cartoes.reshape(-1, cartoes.shape[-1])
+        if minimo <= 0:
+            return np.tile(self.todos, (len(cartoes), 1))
+
+        resultado = np.zeros((len(cartoes), self.ocorrencias.shape[1]), dtype=np.uint64)
+        grupos = [list(posicoes) for posicoes in combinations(range(cartoes.shape[1]), minimo)]
+        for inicio in range(0, len(cartoes), tamanho_lote):
+            listas = self.ocorrencias[cartoes[inicio:inicio + tamanho_lote]]  # lote×n×palavras
+            parte = resultado[inicio:inicio + tamanho_lote]
+            for posicoes in grupos:
+                parte |= np.bitwise_and.reduce(listas[:, posicoes], axis=1)
+        return resultado
+
+    def contar(self, bitsets):
+        """Quantos concursos há em cada bitset."""
+        return popcount(np.asarray(bitsets)).sum(axis=-1, dtype=np.int64)
+
+    def posicoes(self, bitset):
+        """Linhas do histórico (em ordem) presentes em um bitset."""
+        return self.posicoes_lote(np.asarray(bitset)[None])[1]
+
+    def posicoes_lote(self, bitsets):
+        """Pares (índice do bitset, linha do histórico) de todos os bits ligados em M bitsets.
+
+        Só as palavras não nulas são expandidas, então o custo acompanha o número de resultados.
+        """
+        bitsets = np.asarray(bitsets, dtype=np.uint64)
+        indices, palavras = np.nonzero(bitsets)
+        bits = np.unpackbits(bitsets[indices, palavras].view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+        qual, bit = np.nonzero(bits)
+        return indices[qual], palavras[qual] * 64 + bit
+
+    def concursos_em(self, bitset):
+        """Números dos concursos presentes em um bitset."""
+        return self.concursos[self.posicoes(bitset)]
@@ -0,0 +1,216 @@
+"""Instrumentação leve do pipeline: tempo, chamadas e memória por etapa, latência das
+requisições HTTP, tentativas extras e acertos/faltas de cache no caminho de download.
+
+Desligada por padrão: nesse caso `etapa` e os `registrar_*` só checam uma flag. Cada
+execução pode ter seu próprio coletor (`usar`, guardado num contextvar), para que uma
+sessão do Streamlit não ligue, desligue nem apague a coleta de outra; fora disso vale o
+coletor do processo. O resultado é exportado como trace JSON no formato do
+chrome://tracing / Perfetto, com o resumo em `otherData`.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# Limites superiores (ms) das faixas do histograma de latência; a última faixa é "acima"
+FAIXAS_LATENCIA_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# O tracemalloc é do processo: fica ligado enquanto algum coletor o estiver usando
+_TRAVA_TRACEMALLOC = threading.Lock()
+_usos_tracemalloc = 0
+_tracemalloc_proprio = False
+
+def _usar_tracemalloc():
+    global _usos_tracemalloc, _tracemalloc_proprio
+    with _TRAVA_TRACEMALLOC:
+        if not _usos_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_proprio = True
+        _usos_tracemalloc += 1
+
+def _liberar_tracemalloc():
+    global _usos_tracemalloc, _tracemalloc_proprio
+    with _TRAVA_TRACEMALLOC:
+        _usos_tracemalloc -= 1
+        # Só para o tracemalloc que foi ligado aqui
+        if not _usos_tracemalloc and _tracemalloc_proprio:
+            tracemalloc.stop()
+            _tracemalloc_proprio = False
+
+class Instrumentacao:
+    def __init__(self):
+        self.ativa = False
+        self.medir_memoria = False
+        self._trava = threading.Lock()
+        self.limpar()
+
+    def ativar(self, medir_memoria=False):
+        """Liga a coleta. A memória usa tracemalloc, que deixa as alocações bem mais lentas
+        (em todo o processo, enquanto algum coletor medir memória)."""
+        if medir_memoria and not self.medir_memoria:
+            _usar_tracemalloc()
+        elif not medir_memoria and self.medir_memoria:
+            _liberar_tracemalloc()
+        self.medir_memoria = medir_memoria
+        self.ativa = True
+
+    def desativar(self):
+        if self.medir_memoria:
+            _liberar_tracemalloc()
+        self.medir_memoria = False
+        self.ativa = False
+
+    def limpar(self):
+        with self._trava:
+            self._origem = time.perf_counter()
+            self.etapas = {}
+            self.http = {
+                'requisicoes': 0,
+                'falhas': 0,
+                'tentativas_extras': 0,
+                'latencia_total_ms': 0.0,
+                'latencia_max_ms': 0.0,
+                'status': {},
+                'histograma': [0] * (len(FAIXAS_LATENCIA_MS) + 1),
+            }
+            self.cache = {}
+            self.eventos = []
+
+    # -------------------- registro --------------------
+
+    def registrar_etapa(self, nome, inicio, duracao, memoria=0):
+        """Registra uma execução de `nome` (tempos em segundos do perf_counter, memória em bytes)."""
+        if not self.ativa:
+            return
+        with self._trava:
+            etapa = self.etapas.setdefault(
+                nome, {'chamadas': 0, 'tempo_total_s': 0.0, 'tempo_max_s': 0.0, 'memoria_mb': 0.0}
+            )
+            etapa['chamadas'] += 1
+            etapa['tempo_total_s'] += duracao
+            etapa['tempo_max_s'] = max(etapa['tempo_max_s'], duracao)
+            etapa['memoria_mb'] += memoria / 2 ** 20
+            self.eventos.append((nome, inicio - self._origem, duracao, threading.get_ident()))
+
+    @contextmanager
+    def etapa(self, nome):
+        """Mede o bloco como uma execução da etapa `nome` (pode ser aninhado)."""
+        if not self.ativa:
+            yield
+            return
+        memoria = self.medir_memoria and tracemalloc.is_tracing()
+        antes = tracemalloc.get_traced_memory()[0] if memoria else 0
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            delta = tracemalloc.get_traced_memory()[0] - antes if memoria else 0
+            self.registrar_etapa(nome, inicio, duracao, delta)
+
+    def registrar_http(self, latencia, status=None, falha=False, tentativa=0):
+        """Uma requisição: latência em segundos, código HTTP (None se não houve resposta)."""
+        if not self.ativa:
+            return
+        latencia_ms = latencia * 1000
+        with self._trava:
+            http = self.http
+            http['requisicoes'] += 1
+            http['falhas'] += bool(falha)
+            http['tentativas_extras'] += tentativa > 0
+            http['latencia_total_ms'] += latencia_ms
+            http['latencia_max_ms'] = max(http['latencia_max_ms'], latencia_ms)
+            chave = str(status) if status is not None else 'sem_resposta'
+            http['status'][chave] = http['status'].get(chave, 0) + 1
+            http['histograma'][bisect_left(FAIXAS_LATENCIA_MS, latencia_ms)] += 1
+
+    def registrar_cache(self, nome, acertos=0, faltas=0):
+        if not self.ativa:
+            return
+        with self._trava:
+            cache = self.cache.setdefault(nome, {'acertos': 0, 'faltas': 0})
+            cache['acertos'] += acertos
+            cache['faltas'] += faltas
+
+    # -------------------- leitura --------------------
+
+    def histograma_latencia(self):
+        """Lista de (faixa, requisições) na ordem das faixas."""
+        rotulos = [f"≤{limite} ms" for limite in FAIXAS_LATENCIA_MS] + [f">{FAIXAS_LATENCIA_MS[-1]} ms"]
+        return list(zip(rotulos, self.http['histograma']))
+
+    def resumo(self):
+        with self._trava:
+            http = dict(self.http, status=dict(self.http['status']))
+            etapas = {nome: dict(valores) for nome, valores in self.etapas.items()}
+            cache = {nome: dict(valores) for nome, valores in self.cache.items()}
+        http['latencia_media_ms'] = http['latencia_total_ms'] / http['requisicoes'] if http['requisicoes'] else 0.0
+        http['histograma'] = dict(self.histograma_latencia())
+        for valores in cache.values():
+            total = valores['acertos'] + valores['faltas']
+            valores['taxa_acerto'] = valores['acertos'] / total if total else None
+        return {'etapas': etapas, 'http': http, 'cache': cache}
+
+    def para_trace(self):
+        """Trace JSON (eventos "X" do Chrome Trace Event Format, tempos em µs)."""
+        with self._trava:
+            eventos = list(self.eventos)
+        return {
+            'traceEvents': [
+                {'name': nome, 'ph': 'X', 'ts': round(inicio * 1e6, 1), 'dur': round(duracao * 1e6, 1),
+                 'pid': os.getpid(), 'tid': thread}
+                for nome, inicio, duracao, thread in eventos
+            ],
+            'displayTimeUnit': 'ms',
+            'otherData': self.resumo(),
+        }
+
+    def salvar_trace(self, caminho):
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(self.para_trace(), arquivo, ensure_ascii=False)
+
+_COLETOR = contextvars.ContextVar('instrumentacao', default=None)
+_DO_PROCESSO = Instrumentacao()
+
+def atual():
+    """Coletor da execução corrente (o de `usar`) ou, se não houver, o do processo."""
+    return _COLETOR.get() or _DO_PROCESSO
+
+def usar(instrumentacao):
+    """Faz `instrumentacao` (ou None, para voltar ao do processo) valer no contexto atual.
+
+    Threads novas não herdam o contexto: submeta com `contextvars.copy_context().run`.
+    """
+    _COLETOR.set(instrumentacao)
+    return instrumentacao
+
+class _Encaminhador:
+    """Repassa atributos e métodos para o coletor `atual()`."""
+
+    def __getattr__(self, nome):
+        return getattr(atual(), nome)
+
+# Usada pelos módulos de coleta e análise; registra sempre no coletor da execução corrente
+INSTRUMENTACAO = _Encaminhador()
+
+def etapa(nome):
+    return INSTRUMENTACAO.etapa(nome)
+
+def instrumentado(nome=None):
+    """Decorador que mede cada chamada da função como a etapa `nome` (padrão: nome da função)."""
+    def decorar(funcao):
+        rotulo = nome or funcao.__name__
+
+        @wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not INSTRUMENTACAO.ativa:
+                return funcao(*args, **kwargs)
+            with INSTRUMENTACAO.etapa(rotulo):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorar
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from matriz_sorteios import TOTAL_DEZENAS, como_matriz
+
+class JanelasFrequencia:
+    """Frequência e atraso das dezenas em qualquer janela de concursos.
+
+    Pré-calcula as somas acumuladas da matriz de incidência N×80 e o índice da última
+    aparição de cada dezena até cada concurso. Com isso, a frequência em [inicio, fim)
+    custa O(80) e o atraso em qualquer ponto, uma leitura. As posições são índices de
+    linha da matriz (0 = concurso mais antigo carregado).
+    """
+
+    def __init__(self, dados):
+        self.matriz = como_matriz(dados)
+        incidencia = self.matriz.incidencia
+        n = len(incidencia)
+
+        self.acumulada = np.zeros((n + 1, TOTAL_DEZENAS), dtype=np.int32)
+        np.cumsum(incidencia, axis=0, dtype=np.int32, out=self.acumulada[1:])
+
+        # ultima_aparicao[t, j]: última linha <= t em que a dezena j+1 saiu (-1 se nunca)
+        posicoes = np.where(incidencia, np.arange(n, dtype=np.int32)[:, None], np.int32(-1))
+        self.ultima_aparicao = np.maximum.accumulate(posicoes, axis=0) if n else posicoes
+
+    def __len__(self):
+        return len(self.matriz)
+
+    def _intervalo(self, inicio, fim):
+        # Mesma semântica de um fatiamento [inicio:fim]: negativos contam do fim e tudo é
+        # limitado a [0, n]; se inicio passar de fim, a janela fica vazia
+        n = len(self)
+        fim = n if fim is None else min(max(fim + n if fim < 0 else fim, 0), n)
+        inicio = 0 if inicio is None else min(max(inicio + n if inicio < 0 else inicio, 0), fim)
+        return inicio, fim
+
+    def posicao_do_concurso(self, concurso):
+        """Índice da linha do concurso (ou da primeira linha posterior a ele)."""
+        return int(np.searchsorted(self.matriz.concursos, concurso))
+
+    def frequencia(self, inicio=None, fim=None):
+        """Frequência das dezenas 1..80 nas linhas [inicio, fim); aceita índices negativos."""
+        inicio, fim = self._intervalo(inicio, fim)
+        return self.acumulada[fim] - self.acumulada[inicio]
+
+    def frequencia_concursos(self, primeiro, ultimo):
+        """Frequência entre os concursos `primeiro` e `ultimo` (inclusive)."""
+        return self.frequencia(self.posicao_do_concurso(primeiro), self.posicao_do_concurso(ultimo + 1))
+
+    def top_dezenas(self, quantidade=40, inicio=None, fim=None):
+        """Equivalente, para a janela, a `freq.nlargest(quantidade)`; empates pela menor dezena."""
+        frequencia = self.frequencia(inicio, fim)
+        ordem = np.argsort(-frequencia, kind='stable')[:quantidade]
+        return pd.Series(frequencia[ordem], index=ordem + 1)
+
+    def atraso(self, fim=None):
+        """Concursos desde a última aparição de cada dezena, olhando as linhas antes de `fim`.
+
+        Uma dezena que nunca saiu nesse trecho tem atraso igual ao tamanho do trecho.
+        """
+        _, fim = self._intervalo(None, fim)
+        if fim == 0:
+            return np.zeros(TOTAL_DEZENAS, dtype=np.int64)
+        return (fim - 1 - self.ultima_aparicao[fim - 1]).astype(np.int64)
+
+    def atraso_maximo(self, fim=None):
+        """Maior atraso já registrado por cada dezena até `fim` (inclusive o atraso atual)."""
+        _, fim = self._intervalo(None, fim)
+        maximos = self.atraso(fim)
+        incidencia = self.matriz.incidencia[:fim]
+        for j in range(TOTAL_DEZENAS):
+            aparicoes = np.flatnonzero(incidencia[:, j])
+            if len(aparicoes) > 1:
+                maximos[j] = max(maximos[j], np.diff(aparicoes).max() - 1)
+        return maximos
+
+    def tabela_atrasos(self, inicio=None, fim=None):
+        """DataFrame por dezena com frequência na janela, atraso atual e atraso máximo."""
+        _, fim_abs = self._intervalo(inicio, fim)
+        return pd.DataFrame({
+            'dezena': np.arange(1, TOTAL_DEZENAS + 1),
+            'frequência': self.frequencia(inicio, fim),
+            'atraso_atual': self.atraso(fim_abs),
+            'atraso_máximo': self.atraso_maximo(fim_abs),
+        })
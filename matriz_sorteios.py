@@ -0,0 +1,91 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+TOTAL_DEZENAS = 80
+DEZENAS_POR_SORTEIO = 5
+
+class MatrizSorteios:
+    """Histórico de sorteios em forma matricial.
+
+    - `dezenas`: matriz N×5 `uint8` com as dezenas de cada sorteio em ordem crescente;
+    - `incidencia`: matriz N×80 booleana (coluna j ↔ dezena j+1), calculada sob demanda;
+    - `concursos` e `datas`: vetores paralelos às linhas.
+    """
+
+    def __init__(self, dezenas, concursos=None, datas=None):
+        dezenas = np.asarray(dezenas)
+        if dezenas.size == 0:
+            dezenas = dezenas.reshape(0, DEZENAS_POR_SORTEIO)
+        if dezenas.ndim != 2 or dezenas.shape[1] != DEZENAS_POR_SORTEIO:
+            raise ValueError(f"Esperado um array N×{DEZENAS_POR_SORTEIO}, recebido {dezenas.shape}")
+        if dezenas.size and (dezenas.min() < 1 or dezenas.max() > TOTAL_DEZENAS):
+            raise ValueError(f"Dezenas devem estar entre 1 e {TOTAL_DEZENAS}")
+
+        self.dezenas = np.sort(dezenas.astype(np.uint8), axis=1)
+        n = len(self.dezenas)
+        self.concursos = (np.arange(1, n + 1, dtype=np.int32) if concursos is None
+                          else np.asarray(concursos, dtype=np.int32))
+        self.datas = (np.full(n, None, dtype=object) if datas is None
+                      else np.asarray(datas, dtype=object))
+        if len(self.concursos) != n or len(self.datas) != n:
+            raise ValueError("concursos e datas devem ter uma entrada por sorteio")
+        self._incidencia = None
+
+    @classmethod
+    def de_dataframe(cls, df):
+        """Converte um DataFrame com a coluna 'dezenas' (e opcionalmente 'concurso'/'data')."""
+        dezenas = np.array(df['dezenas'].tolist(), dtype=np.int64).reshape(-1, DEZENAS_POR_SORTEIO)
+        concursos = df['concurso'].to_numpy() if 'concurso' in df else None
+        datas = df['data'].to_numpy() if 'data' in df else None
+        return cls(dezenas, concursos, datas)
+
+    def __len__(self):
+        return len(self.dezenas)
+
+    def __getitem__(self, indice):
+        """Fatia as linhas (ex.: `matriz[-500:]`), preservando o tipo."""
+        if isinstance(indice, (int, np.integer)):
+            indice = slice(indice, indice + 1 or None)
+        return MatrizSorteios(self.dezenas[indice], self.concursos[indice], self.datas[indice])
+
+    @property
+    def incidencia(self):
+        if self._incidencia is None:
+            incidencia = np.zeros((len(self), TOTAL_DEZENAS), dtype=bool)
+            linhas = np.repeat(np.arange(len(self)), DEZENAS_POR_SORTEIO)
+            incidencia[linhas, self.dezenas.ravel().astype(np.intp) - 1] = True
+            self._incidencia = incidencia
+        return self._incidencia
+
+    @property
+    def incidencia_compacta(self):
+        """Incidência empacotada em bits: N×10 `uint8`."""
+        return np.packbits(self.incidencia, axis=1)
+
+    def frequencia(self):
+        """Vetor com a frequência absoluta das dezenas 1..80 (índice 0 ↔ dezena 1)."""
+        return np.bincount(self.dezenas.ravel(), minlength=TOTAL_DEZENAS + 1)[1:]
+
+    def impressao_digital(self):
+        """Hash do conteúdo (concursos e dezenas), para usar como chave de cache."""
+        resumo = hashlib.blake2b(digest_size=16)
+        resumo.update(self.concursos.tobytes())
+        resumo.update(self.dezenas.tobytes())
+        return resumo.hexdigest()
+
+    def para_dataframe(self):
+        return pd.DataFrame({
+            'concurso': self.concursos,
+            'dezenas': self.dezenas.astype(int).tolist(),
+            'data': self.datas,
+        })
+
+def como_matriz(dados):
+    """Aceita uma MatrizSorteios, um DataFrame com a coluna 'dezenas' ou um array N×5."""
+    if isinstance(dados, MatrizSorteios):
+        return dados
+    if isinstance(dados, pd.DataFrame):
+        return MatrizSorteios.de_dataframe(dados)
+    return MatrizSorteios(np.asarray(dados))
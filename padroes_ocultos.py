@@ -1,66 +1,56 @@
-def analisar_padroes_ocultos(df):
-    df = df.copy()
-
+import numpy as np
+
+from instrumentacao import instrumentado
+from matriz_sorteios import MatrizSorteios, como_matriz
+
+COLUNAS_FAIXAS = ['faixa_baixa', 'faixa_media', 'faixa_alta']
+COLUNAS_COLUNAS = [f'col_{i}' for i in range(10)]
+COLUNAS_LINHAS = [f'linha_{i+1}' for i in range(8)]
+
+def contar_por_classe(classes, n_classes):
+    """Conta, linha a linha, quantos elementos caem em cada classe 0..n_classes-1."""
+    n = len(classes)
+    deslocadas = classes + (np.arange(n) * n_classes)[:, None]
+    return np.bincount(deslocadas.ravel(), minlength=n * n_classes).reshape(n, n_classes)
+
+def extrair_caracteristicas(dados):
+    """Extrai, numa única passada vetorizada, as características de cada sorteio/cartão.
+
+    Aceita uma MatrizSorteios, um DataFrame com 'dezenas' ou um array M×5. Retorna um
+    dicionário coluna -> array; 'distancias' vem como matriz M×4.
+    """
+    if isinstance(dados, np.ndarray):
+        dezenas = np.sort(dados.astype(np.int64), axis=1)
+    else:
+        dezenas = como_matriz(dados).dezenas.astype(np.int64)
+
+    distancias = np.diff(dezenas, axis=1)
+    faixas = contar_por_classe(np.searchsorted([26, 53], dezenas, side='left'), 3)
+    colunas = contar_por_classe(dezenas % 10, 10)
+    linhas = contar_por_classe((dezenas - 1) // 10, 8)
+
+    caracteristicas = {}
     # Faixas: baixa (1-26), média (27-53), alta (54-80)
-    def faixa_numerica(dezenas):
-        baixa = sum(1 for d in dezenas if 1 <= d <= 26)
-        media = sum(1 for d in dezenas if 27 <= d <= 53)
-        alta = sum(1 for d in dezenas if 54 <= d <= 80)
-        return baixa, media, alta
-
-    faixas = df['dezenas'].apply(faixa_numerica)
-    df[['faixa_baixa', 'faixa_media', 'faixa_alta']] = pd.DataFrame(faixas.tolist(), index=df.index)
-
+    caracteristicas.update(zip(COLUNAS_FAIXAS, faixas.T))
     # Colunas: unidade (coluna do volante)
-    def colunas(dezenas):
-        col = [0] * 10
-        for d in dezenas:
-            col[d % 10] += 1
-        return col
-
-    colunas_dist = df['dezenas'].apply(colunas)
-    col_df = pd.DataFrame(colunas_dist.tolist(), index=df.index)
-    col_df.columns = [f'col_{i}' for i in range(10)]
-    df = pd.concat([df, col_df], axis=1)
-
+    caracteristicas.update(zip(COLUNAS_COLUNAS, colunas.T))
     # Linhas (1-10, 11-20, ..., 71-80)
-    def linhas(dezenas):
-        linha = [0] * 8
-        for d in dezenas:
-            index = (d - 1) // 10
-            linha[index] += 1
-        return linha
-
-    linhas_dist = df['dezenas'].apply(linhas)
-    lin_df = pd.DataFrame(linhas_dist.tolist(), index=df.index)
-    lin_df.columns = [f'linha_{i+1}' for i in range(8)]
-    df = pd.concat([df, lin_df], axis=1)
-
-    # Distâncias e amplitude
-    df['distancias'] = df['dezenas'].apply(lambda x: [b - a for a, b in zip(sorted(x), sorted(x)[1:])])
-    df['amplitude'] = df['dezenas'].apply(lambda x: max(x) - min(x))
-    df['min'] = df['dezenas'].apply(min)
-    df['max'] = df['dezenas'].apply(max)
-
-    # Média aritmética
-    df['media'] = df['dezenas'].apply(lambda x: round(sum(x) / len(x), 2))
-
+    caracteristicas.update(zip(COLUNAS_LINHAS, linhas.T))
+    # Distâncias, amplitude e média aritmética
+    caracteristicas['distancias'] = distancias
+    caracteristicas['amplitude'] = dezenas[:, -1] - dezenas[:, 0]
+    caracteristicas['min'] = dezenas[:, 0]
+    caracteristicas['max'] = dezenas[:, -1]
+    caracteristicas['media'] = np.round(dezenas.sum(axis=1) / dezenas.shape[1], 2)
     # Sequências consecutivas
-    def sequencias_consecutivas(dezenas):
-        dezenas = sorted(dezenas)
-        contagem = 0
-        for i in range(len(dezenas) - 1):
-            if dezenas[i+1] - dezenas[i] == 1:
-                contagem += 1
-        return contagem
+    caracteristicas['sequencias'] = (distancias == 1).sum(axis=1)
+    return caracteristicas
 
-    df['sequencias'] = df['dezenas'].apply(sequencias_consecutivas)
-
-    return df
-
-# 🔁 Aplicar ao DataFrame existente
-df_padroes = analisar_padroes_ocultos(df_estatisticas)
+@instrumentado()
+def analisar_padroes_ocultos(df):
+    matriz = como_matriz(df)
+    df = matriz.para_dataframe() if isinstance(df, MatrizSorteios) else df
 
-# Exemplo: visualizar as novas colunas com padrões
-print(df_padroes[['concurso', 'faixa_baixa', 'faixa_media', 'faixa_alta', 
-                  'amplitude', 'media', 'sequencias']].head())
+    caracteristicas = extrair_caracteristicas(matriz)
+    caracteristicas['distancias'] = caracteristicas['distancias'].tolist()
+    return df.assign(**caracteristicas)
@@ -0,0 +1,125 @@
+"""Probabilidade exata de prêmio de um conjunto de cartões no próximo concurso.
+
+Os cartões são conferidos contra todos os C(80, 5) = 24.040.016 resultados possíveis,
+com bitsets de cartões e popcount. Só as dezenas presentes em algum cartão importam: os
+resultados são agrupados pela parte que cai nessa união, e cada grupo pesa C(80 − U, 5 − j)
+(U = tamanho da união, j = dezenas sorteadas dentro dela). Com as 80 dezenas em jogo isso
+é a enumeração completa; com cartões de um conjunto menor, bem menos trabalho, mesmo resultado.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+
+import numpy as np
+import pandas as pd
+
+from combinatoria import desranquear, total_combinacoes
+from conferencia import FAIXAS_PREMIO, popcount
+from instrumentacao import instrumentado
+from matriz_sorteios import DEZENAS_POR_SORTEIO, TOTAL_DEZENAS
+
+TOTAL_RESULTADOS = total_combinacoes(DEZENAS_POR_SORTEIO)
+
+# Valor (p0, p1, p2) do contador de 3 bits para cada quantidade de acertos 1..5
+_PADROES_ACERTOS = {1: (1, 0, 0), 2: (0, 1, 0), 3: (1, 1, 0), 4: (0, 0, 1), 5: (1, 0, 1)}
+
+def _avaliar_bloco(ocorrencias, total_cartoes, tamanho, inicio, fim):
+    """Conta, para os subconjuntos de ranks [inicio, fim) com `tamanho` dezenas da união,
+    o melhor acerto (0..5) e quantos cartões caem em cada faixa de prêmio.
+
+    `ocorrencias[n]` é o bitset dos cartões que contêm a dezena n. Somar as linhas das
+    dezenas sorteadas num contador de 3 bits por cartão (soma bit a bit, 64 cartões por
+    palavra) dá os acertos de cada cartão; o popcount de cada padrão conta os cartões.
+    """
+    sorteios = desranquear(np.arange(inicio, fim), tamanho)
+    contagens = {qtd: np.zeros(len(sorteios), dtype=np.intp) for qtd in _PADROES_ACERTOS}
+    # Uma palavra (64 cartões) por vez: vetores contíguos, sem redução num eixo curto
+    for palavra in np.ascontiguousarray(ocorrencias.T):
+        p0, p1, p2 = (np.zeros(len(sorteios), dtype=np.uint64) for _ in range(3))
+        for i in range(tamanho):
+            bits = palavra[sorteios[:, i]]
+            vai_um = p0 & bits
+            p0 ^= bits
+            p2 |= p1 & vai_um
+            p1 ^= vai_um
+
+        planos = ((~p0, p0), (~p1, p1), (~p2, p2))
+        for qtd, padrao in _PADROES_ACERTOS.items():
+            contagens[qtd] += popcount(planos[0][padrao[0]] & planos[1][padrao[1]] & planos[2][padrao[2]])
+
+    melhor_por_sorteio = np.zeros(len(sorteios), dtype=np.intp)
+    for qtd, contagem in contagens.items():
+        melhor_por_sorteio[contagem > 0] = qtd
+
+    melhor = np.bincount(melhor_por_sorteio, minlength=DEZENAS_POR_SORTEIO + 1)
+    por_faixa = np.stack([np.bincount(contagens[qtd], minlength=total_cartoes + 1) for qtd in FAIXAS_PREMIO])
+    return tamanho, melhor, por_faixa
+
+@instrumentado()
+def distribuicao_premios(cartoes, processos=None, tamanho_bloco=250_000):
+    """Distribuição exata dos prêmios de `cartoes` (M×5) sobre todos os resultados possíveis.
+
+    Retorna {'total', 'melhor_acerto', 'cartoes_por_faixa'} com contagens inteiras de
+    resultados: `melhor_acerto[a]` é em quantos resultados o melhor cartão acerta `a`
+    dezenas; `cartoes_por_faixa[f, k]`, em quantos exatamente `k` cartões ficam na faixa
+    `f` (na ordem de FAIXAS_PREMIO). Dividir por `total` dá as probabilidades.
+    """
+    cartoes = np.asarray(cartoes, dtype=np.int64).reshape(-1, DEZENAS_POR_SORTEIO)
+    uniao = np.unique(cartoes)
+    # Dezenas renumeradas 1..U dentro da união: as combinações da união são ranks 0..C(U, j)-1
+    locais = np.searchsorted(uniao, cartoes) + 1
+    palavras = -(-len(cartoes) // 64)
+    bits = np.zeros((len(uniao) + 1, palavras * 64), dtype=bool)
+    bits[locais, np.arange(len(cartoes))[:, None]] = True
+    ocorrencias = np.packbits(bits, axis=1, bitorder='little').view('<u8')
+
+    fora = TOTAL_DEZENAS - len(uniao)
+    pesos = {j: comb(fora, DEZENAS_POR_SORTEIO - j) for j in range(DEZENAS_POR_SORTEIO + 1)}
+    blocos = [
+        (j, inicio, min(inicio + tamanho_bloco, comb(len(uniao), j)))
+        for j in range(DEZENAS_POR_SORTEIO + 1) if pesos[j]
+        for inicio in range(0, comb(len(uniao), j), tamanho_bloco)
+    ]
+
+    processos = processos or os.cpu_count() or 1
+    argumentos = ([ocorrencias] * len(blocos), [len(cartoes)] * len(blocos), *zip(*blocos))
+    if processos == 1 or len(blocos) <= 2:
+        partes = list(map(_avaliar_bloco, *argumentos))
+    else:
+        with ProcessPoolExecutor(max_workers=min(processos, len(blocos))) as executor:
+            partes = list(executor.map(_avaliar_bloco, *argumentos))
+
+    melhor_acerto = np.zeros(DEZENAS_POR_SORTEIO + 1, dtype=np.int64)
+    cartoes_por_faixa = np.zeros((len(FAIXAS_PREMIO), len(cartoes) + 1), dtype=np.int64)
+    for j, melhor, por_faixa in partes:
+        melhor_acerto += melhor * pesos[j]
+        cartoes_por_faixa += por_faixa * pesos[j]
+    return {'total': TOTAL_RESULTADOS, 'melhor_acerto': melhor_acerto, 'cartoes_por_faixa': cartoes_por_faixa}
+
+def resumo_premios(distribuicao):
+    """Tabela por faixa: chance de ao menos um cartão premiado, de ser a melhor faixa
+    obtida e o número esperado de cartões premiados."""
+    total = distribuicao['total']
+    melhor = distribuicao['melhor_acerto']
+    por_faixa = distribuicao['cartoes_por_faixa']
+    quantidades = np.arange(por_faixa.shape[1])
+
+    linhas = []
+    for i, (qtd, nome) in enumerate(FAIXAS_PREMIO.items()):
+        com_premio = total - por_faixa[i, 0]
+        linhas.append({
+            'faixa': nome,
+            'prob_algum_cartão': com_premio / total,
+            'chance_1_em': total / com_premio if com_premio else float('inf'),
+            'prob_melhor_faixa': melhor[qtd] / total,
+            'cartões_esperados': (por_faixa[i] * quantidades).sum() / total,
+        })
+    premiados = melhor[min(FAIXAS_PREMIO):].sum()
+    linhas.append({
+        'faixa': 'qualquer prêmio',
+        'prob_algum_cartão': premiados / total,
+        'chance_1_em': total / premiados if premiados else float('inf'),
+        'prob_melhor_faixa': premiados / total,
+        'cartões_esperados': sum(linha['cartões_esperados'] for linha in linhas),
+    })
+    return pd.DataFrame(linhas)
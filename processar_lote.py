@@ -0,0 +1,127 @@
+"""Processamento em lote, sem Streamlit: lê os concursos do banco local, roda todas as
+análises e grava os resultados em Parquet (tabelas) e JSON (resumos).
+
+Exemplos:
+    python processar_lote.py --saida resultados/
+    python processar_lote.py --sincronizar --concursos 2500 --formato json --saida resultados/
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+def _para_json(valor):
+    # Tipos do numpy/pandas viram tipos nativos
+    if hasattr(valor, 'item'):
+        return valor.item()
+    if hasattr(valor, 'tolist'):
+        return valor.tolist()
+    return str(valor)
+
+def executar_analises(matriz):
+    """Roda o pipeline completo e devolve (tabelas, resumos)."""
+    # Importações aqui para que `--help` e erros de argumento não paguem o custo do numpy/pandas
+    from agregados import estatisticas_agregadas
+    from analise_cartao import analisar_saltos, calcular_frequencia_global
+    from coocorrencia import IndiceCoocorrencia
+    from estatisticas_basicas import calcular_estatisticas
+    from janelas import JanelasFrequencia
+    from padroes_ocultos import analisar_padroes_ocultos
+
+    df_estatisticas = calcular_estatisticas(matriz)
+    df_padroes = analisar_padroes_ocultos(df_estatisticas)
+    coocorrencia = IndiceCoocorrencia.de_sorteios(matriz)
+
+    tabelas = {
+        'padroes': df_padroes,
+        'atrasos': JanelasFrequencia(matriz).tabela_atrasos(),
+    }
+    resumos = {
+        'concursos': {
+            'quantidade': len(matriz),
+            'primeiro': int(matriz.concursos[0]) if len(matriz) else None,
+            'ultimo': int(matriz.concursos[-1]) if len(matriz) else None,
+        },
+        'resumo': estatisticas_agregadas(df_padroes) if len(matriz) else {},
+        'frequencia': calcular_frequencia_global(matriz),
+        'saltos': analisar_saltos(matriz),
+        'pares_mais_comuns': coocorrencia.mais_comuns(2, 20),
+        'trincas_mais_comuns': coocorrencia.mais_comuns(3, 20),
+    }
+    return tabelas, resumos
+
+def gravar_resultados(tabelas, resumos, saida, formato='parquet'):
+    saida = Path(saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    arquivos = []
+    for nome, tabela in tabelas.items():
+        if formato == 'parquet':
+            caminho = saida / f'{nome}.parquet'
+            tabela.to_parquet(caminho, index=False)
+        else:
+            caminho = saida / f'{nome}.json'
+            tabela.to_json(caminho, orient='records', force_ascii=False)
+        arquivos.append(caminho)
+
+    caminho = saida / 'resumo.json'
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(resumos, arquivo, ensure_ascii=False, indent=2, default=_para_json)
+    arquivos.append(caminho)
+    return arquivos
+
+def main(argv=None):
+    from armazenamento import CAMINHO_BANCO
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--banco', default=str(CAMINHO_BANCO), help="banco SQLite de concursos")
+    parser.add_argument('--saida', default='resultados', help="diretório onde gravar os resultados")
+    parser.add_argument('--concursos', type=int, help="analisa só os N concursos mais recentes")
+    parser.add_argument('--formato', choices=['parquet', 'json'], default='parquet',
+                        help="formato das tabelas (Parquet requer pyarrow)")
+    parser.add_argument('--sincronizar', action='store_true',
+                        help="antes de analisar, baixa da API os concursos que faltam no banco")
+    parser.add_argument('--trace', help="grava um trace JSON com o tempo de cada etapa e das requisições")
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        from instrumentacao import INSTRUMENTACAO
+        INSTRUMENTACAO.ativar(medir_memoria=True)
+
+    from armazenamento import abrir_banco, carregar_concursos
+    from matriz_sorteios import MatrizSorteios
+
+    conexao = abrir_banco(args.banco)
+    try:
+        if args.sincronizar:
+            from coleta_dados import obter_ultimo_concurso, sincronizar_banco
+
+            avisos = []
+            ultimo = obter_ultimo_concurso()
+            desde = max(1, ultimo - args.concursos + 1) if args.concursos else None
+            novos = sincronizar_banco(conexao, ultimo, desde=desde, avisos=avisos)
+            for aviso in avisos:
+                print(aviso, file=sys.stderr)
+            print(f"{novos} concursos novos gravados no banco.")
+        df = carregar_concursos(conexao, args.concursos)
+    finally:
+        conexao.close()
+
+    if df.empty:
+        print("Nenhum concurso no banco. Use --sincronizar para baixá-los.", file=sys.stderr)
+        return 1
+
+    tabelas, resumos = executar_analises(MatrizSorteios.de_dataframe(df))
+    try:
+        arquivos = gravar_resultados(tabelas, resumos, args.saida, args.formato)
+    except ImportError as erro:
+        print(f"Não foi possível gravar Parquet ({erro}); use --formato json ou instale pyarrow.", file=sys.stderr)
+        return 1
+    if args.trace:
+        INSTRUMENTACAO.salvar_trace(args.trace)
+        arquivos.append(args.trace)
+    for caminho in arquivos:
+        print(caminho)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
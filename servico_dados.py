@@ -0,0 +1,152 @@
+"""Serviço de dados compartilhado por todas as sessões do processo.
+
+Com vários usuários, cada sessão do Streamlit que perdesse o cache podia disparar sua
+própria coleta, e o `st.cache_data` devolve uma cópia dos dados a cada chamada. Aqui:
+
+- carga única: quem pede um dado que já está sendo calculado espera por essa mesma carga;
+- uma só cópia, somente leitura, da matriz de sorteios e de cada tabela derivada;
+- atualização atômica: quando os dados vencem, uma sessão recarrega enquanto as demais
+  continuam com a versão anterior, trocada por inteiro no fim.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from armazenamento import CAMINHO_BANCO, abrir_banco, carregar_concursos
+from coleta_dados import obter_ultimo_concurso, sincronizar_banco
+from importacao import preencher_com_arquivo
+from instrumentacao import INSTRUMENTACAO
+from matriz_sorteios import MatrizSorteios
+
+class CargaUnica:
+    """Executa no máximo uma vez por chave ao mesmo tempo; as chamadas concorrentes esperam o resultado."""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._em_andamento = {}
+
+    def em_andamento(self, chave):
+        with self._trava:
+            return chave in self._em_andamento
+
+    def executar(self, chave, funcao):
+        with self._trava:
+            futuro = self._em_andamento.get(chave)
+            dono = futuro is None
+            if dono:
+                futuro = self._em_andamento[chave] = Future()
+        if not dono:
+            return futuro.result()
+
+        try:
+            resultado = funcao()
+        except BaseException as erro:
+            futuro.set_exception(erro)
+            raise
+        else:
+            futuro.set_result(resultado)
+            return resultado
+        finally:
+            with self._trava:
+                del self._em_andamento[chave]
+
+def _somente_leitura(matriz):
+    for vetor in (matriz.dezenas, matriz.concursos, matriz.datas):
+        vetor.setflags(write=False)
+    return matriz
+
+class _Conjunto:
+    """Uma versão imutável dos dados: o histórico do banco e as janelas já recortadas."""
+
+    def __init__(self, matriz, inicio, ultimo):
+        self.matriz = _somente_leitura(matriz)
+        self.inicio = inicio
+        self.ultimo = ultimo
+        self.carregado_em = time.monotonic()
+        self._janelas = {}
+        self._trava = threading.Lock()
+
+    def cobre(self, qtd):
+        return self.inicio <= max(1, self.ultimo - qtd + 1)
+
+    def janela(self, qtd):
+        # Mesma MatrizSorteios para todas as sessões que pedem a mesma quantidade
+        with self._trava:
+            if qtd not in self._janelas:
+                self._janelas[qtd] = _somente_leitura(self.matriz[-qtd:] if qtd else self.matriz[:0])
+            return self._janelas[qtd]
+
+class ServicoDados:
+    def __init__(self, validade=3600, max_derivados=64, caminho_banco=CAMINHO_BANCO):
+        self.validade = validade
+        self.max_derivados = max_derivados
+        self.caminho_banco = caminho_banco
+        self._carga = CargaUnica()
+        self._trava = threading.Lock()
+        self._conjunto = None
+        self._derivados = OrderedDict()
+
+    def _vencido(self, conjunto):
+        return time.monotonic() - conjunto.carregado_em > self.validade
+
+    def _recarregar(self, qtd, ao_progredir):
+        anterior = self._conjunto
+        ultimo = obter_ultimo_concurso()
+        inicio = max(1, ultimo - qtd + 1)
+        if anterior is not None:
+            inicio = min(inicio, anterior.inicio)
+
+        conexao = abrir_banco(self.caminho_banco)
+        try:
+            preencher_com_arquivo(conexao, inicio, ultimo)
+            sincronizar_banco(conexao, ultimo, desde=inicio, ao_progredir=ao_progredir)
+            matriz = MatrizSorteios.de_dataframe(carregar_concursos(conexao))
+        finally:
+            conexao.close()
+        # Troca atômica: quem já tinha a versão anterior continua usando-a até pedir de novo
+        self._conjunto = _Conjunto(matriz, inicio, max(ultimo, int(matriz.concursos[-1]) if len(matriz) else 0))
+
+    def concursos(self, qtd, ao_progredir=None):
+        """Os `qtd` concursos mais recentes, como MatrizSorteios somente leitura e compartilhada.
+
+        `ao_progredir(feitos, total)` só é chamado se esta chamada for a que baixa os dados.
+        """
+        while True:
+            conjunto = self._conjunto
+            if conjunto is not None and conjunto.cobre(qtd):
+                if not self._vencido(conjunto) or self._carga.em_andamento('concursos'):
+                    return conjunto.janela(qtd)
+            self._carga.executar('concursos', lambda: self._recarregar(qtd, ao_progredir))
+
+    def derivado(self, matriz, nome, funcao):
+        """`funcao(matriz)` calculada uma única vez por conteúdo da matriz e compartilhada.
+
+        O resultado não deve ser modificado por quem o recebe.
+        """
+        chave = (matriz.impressao_digital(), nome)
+        with self._trava:
+            if chave in self._derivados:
+                self._derivados.move_to_end(chave)
+                INSTRUMENTACAO.registrar_cache('tabelas_compartilhadas', acertos=1)
+                return self._derivados[chave]
+        INSTRUMENTACAO.registrar_cache('tabelas_compartilhadas', faltas=1)
+
+        def calcular():
+            with self._trava:
+                # Outra sessão pode ter terminado entre a consulta acima e esta carga
+                if chave in self._derivados:
+                    return self._derivados[chave]
+            valor = funcao(matriz)
+            with self._trava:
+                self._derivados[chave] = valor
+                while len(self._derivados) > self.max_derivados:
+                    self._derivados.popitem(last=False)
+            return valor
+        return self._carga.executar(chave, calcular)
+
+    def invalidar(self):
+        """Força a recarga no próximo pedido (as sessões seguem com a versão atual até lá)."""
+        conjunto = self._conjunto
+        if conjunto is not None:
+            conjunto.carregado_em = float('-inf')
@@ -0,0 +1,88 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from estatisticas_probabilidades import amostrar_cartoes
+from instrumentacao import instrumentado
+from matriz_sorteios import como_matriz
+from padroes_ocultos import COLUNAS_COLUNAS, COLUNAS_FAIXAS, COLUNAS_LINHAS, extrair_caracteristicas
+
+# Características cuja média ao longo do histórico é comparada com o acaso
+_MEDIAS = {
+    **{f'{nome}_média': nome for nome in COLUNAS_FAIXAS},
+    'média_geral': 'media',
+    'amplitude_média': 'amplitude',
+    'sequências_média': 'sequencias',
+    **{f'{nome}_média': nome for nome in COLUNAS_LINHAS + COLUNAS_COLUNAS},
+}
+
+def estatisticas_historicos(dezenas, tamanho_historico):
+    """Agregados de cada bloco consecutivo de `tamanho_historico` sorteios (um histórico).
+
+    Retorna um DataFrame com uma linha por histórico e as mesmas estatísticas de
+    `estatisticas_agregadas` (médias das características e o máximo de sequências).
+    """
+    caracteristicas = extrair_caracteristicas(dezenas)
+    replicas = len(dezenas) // tamanho_historico
+    corte = replicas * tamanho_historico
+
+    def por_historico(valores):
+        return valores[:corte].reshape(replicas, tamanho_historico)
+
+    colunas = {nome: por_historico(caracteristicas[origem]).mean(axis=1) for nome, origem in _MEDIAS.items()}
+    colunas['sequências_max'] = por_historico(caracteristicas['sequencias']).max(axis=1)
+    return pd.DataFrame(colunas)
+
+def _simular_tarefa(semente, replicas, tamanho_historico):
+    rng = np.random.default_rng(semente)
+    return estatisticas_historicos(amostrar_cartoes(replicas * tamanho_historico, rng), tamanho_historico)
+
+def simular_modelo_nulo(tamanho_historico, total_sorteios=10_000_000, semente=None, processos=None,
+                        sorteios_por_tarefa=1_000_000):
+    """Distribuição nula dos agregados para históricos de sorteios uniformes.
+
+    Simula `total_sorteios` sorteios da Quina, agrupados em históricos do mesmo tamanho
+    do observado, em tarefas paralelas. Cada tarefa recebe sua própria semente derivada
+    de `semente` (SeedSequence.spawn), então o resultado é o mesmo para qualquer
+    número de processos.
+    """
+    replicas = total_sorteios // tamanho_historico
+    if replicas < 1:
+        raise ValueError("total_sorteios deve ser pelo menos o tamanho do histórico")
+    por_tarefa = max(1, sorteios_por_tarefa // tamanho_historico)
+    lotes = [min(por_tarefa, replicas - inicio) for inicio in range(0, replicas, por_tarefa)]
+    sementes = np.random.SeedSequence(semente).spawn(len(lotes))
+
+    processos = processos or os.cpu_count() or 1
+    argumentos = (sementes, lotes, [tamanho_historico] * len(lotes))
+    if processos == 1 or len(lotes) == 1:
+        partes = list(map(_simular_tarefa, *argumentos))
+    else:
+        with ProcessPoolExecutor(max_workers=min(processos, len(lotes))) as executor:
+            partes = list(executor.map(_simular_tarefa, *argumentos))
+    return pd.concat(partes, ignore_index=True)
+
+@instrumentado()
+def comparar_com_modelo_nulo(dados, total_sorteios=10_000_000, semente=None, processos=None):
+    """Percentil e p-valor (bicaudal) de cada agregado observado frente ao acaso."""
+    dezenas = como_matriz(dados).dezenas
+    observadas = estatisticas_historicos(dezenas, len(dezenas)).iloc[0]
+    nulo = simular_modelo_nulo(len(dezenas), total_sorteios, semente, processos)
+
+    linhas = []
+    for nome, valor in observadas.items():
+        distribuicao = nulo[nome].to_numpy()
+        abaixo = (distribuicao <= valor).mean()
+        acima = (distribuicao >= valor).mean()
+        linhas.append({
+            'estatística': nome,
+            'observado': valor,
+            'média_nula': distribuicao.mean(),
+            'p5_nulo': np.percentile(distribuicao, 5),
+            'p95_nulo': np.percentile(distribuicao, 95),
+            'percentil': round(100 * abaixo, 2),
+            'p_valor': min(1.0, 2 * min(abaixo, acima)),
+        })
+    return pd.DataFrame(linhas)
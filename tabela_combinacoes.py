@@ -0,0 +1,140 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from combinatoria import desranquear, total_combinacoes
+from padroes_ocultos import (
+    COLUNAS_COLUNAS, COLUNAS_FAIXAS, COLUNAS_LINHAS, contar_por_classe, extrair_caracteristicas
+)
+
+DIRETORIO_TABELA = Path(__file__).with_name("tabela_combinacoes")
+TOTAL = total_combinacoes(5)
+
+# Cada característica vira um arquivo .npy de largura fixa; a linha i corresponde à
+# combinação de rank i (ver `combinatoria.ranquear`), então as dezenas não são gravadas.
+COLUNAS = {
+    'soma': np.uint16,
+    'pares': np.uint8,
+    **{f'q{i}': np.uint8 for i in range(1, 5)},
+    **{nome: np.uint8 for nome in COLUNAS_FAIXAS},
+    'amplitude': np.uint8,
+    'sequencias': np.uint8,
+    **{nome: np.uint8 for nome in COLUNAS_LINHAS},
+    **{nome: np.uint8 for nome in COLUNAS_COLUNAS},
+}
+
+def _caracteristicas(combinacoes):
+    caracteristicas = extrair_caracteristicas(combinacoes)
+    caracteristicas['soma'] = combinacoes.sum(axis=1)
+    caracteristicas['pares'] = (combinacoes % 2 == 0).sum(axis=1)
+    quadrantes = contar_por_classe((combinacoes - 1) // 20, 4)
+    caracteristicas.update({f'q{i + 1}': quadrantes[:, i] for i in range(4)})
+    return caracteristicas
+
+def construir_tabela(diretorio=DIRETORIO_TABELA, tamanho_lote=1_000_000, ao_progredir=None):
+    """Enumera uma única vez as C(80, 5) combinações e grava suas características em disco."""
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    metadados = diretorio / "metadados.json"
+    metadados.unlink(missing_ok=True)
+
+    arquivos = {
+        nome: np.lib.format.open_memmap(diretorio / f"{nome}.npy", mode='w+', dtype=tipo, shape=(TOTAL,))
+        for nome, tipo in COLUNAS.items()
+    }
+    for inicio in range(0, TOTAL, tamanho_lote):
+        fim = min(inicio + tamanho_lote, TOTAL)
+        combinacoes = desranquear(np.arange(inicio, fim), 5)
+        caracteristicas = _caracteristicas(combinacoes)
+        for nome, arquivo in arquivos.items():
+            arquivo[inicio:fim] = caracteristicas[nome]
+        if ao_progredir:
+            ao_progredir(fim, TOTAL)
+    for arquivo in arquivos.values():
+        arquivo.flush()
+
+    # Gravado por último: marca a tabela como completa
+    metadados.write_text(json.dumps({'total': TOTAL, 'colunas': {n: np.dtype(t).str for n, t in COLUNAS.items()}}))
+    return TabelaCombinacoes(diretorio)
+
+def restricoes_do_resumo(resumo):
+    """Traduz os critérios de `classificar_cartao` em restrições de intervalo sobre a tabela.
+
+    Combinações que atendem todas têm pontuação 4 (a máxima).
+    """
+    media, amplitude = resumo['média_geral'], resumo['amplitude_média']
+    return {
+        'soma': (int(np.ceil(5 * (media - 5))), int(np.floor(5 * (media + 5)))),
+        'amplitude': (int(np.ceil(amplitude - 10)), int(np.floor(amplitude + 10))),
+        'faixa_baixa': int(resumo['faixa_baixa_mais_comum']),
+        'sequencias': (0, int(resumo['sequências_max'])),
+    }
+
+class TabelaCombinacoes:
+    """Consulta, via memória mapeada, a tabela de características gerada por `construir_tabela`.
+
+    Restrições são um dicionário coluna -> valor exato ou (mínimo, máximo), inclusivos.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_TABELA):
+        self.diretorio = Path(diretorio)
+        if not (self.diretorio / "metadados.json").exists():
+            raise FileNotFoundError(
+                f"Tabela de combinações não encontrada em {self.diretorio}; rode construir_tabela()"
+            )
+        self._colunas = {}
+
+    def coluna(self, nome):
+        if nome not in COLUNAS:
+            raise KeyError(f"Coluna desconhecida: {nome}")
+        if nome not in self._colunas:
+            self._colunas[nome] = np.load(self.diretorio / f"{nome}.npy", mmap_mode='r')
+        return self._colunas[nome]
+
+    def _ranks(self, restricoes, tamanho_lote):
+        intervalos = []
+        for nome, valor in restricoes.items():
+            minimo, maximo = valor if isinstance(valor, (tuple, list)) else (valor, valor)
+            limite = np.iinfo(COLUNAS[nome]).max
+            intervalos.append((self.coluna(nome), min(max(minimo, 0), limite), min(max(maximo, 0), limite)))
+
+        for inicio in range(0, TOTAL, tamanho_lote):
+            fim = min(inicio + tamanho_lote, TOTAL)
+            aceitas = np.ones(fim - inicio, dtype=bool)
+            for coluna, minimo, maximo in intervalos:
+                valores = coluna[inicio:fim]
+                aceitas &= (valores >= minimo) & (valores <= maximo)
+            yield np.flatnonzero(aceitas) + inicio
+
+    def ranks(self, restricoes, tamanho_lote=4_000_000):
+        """Ranks (em ordem crescente) de todas as combinações que satisfazem as restrições."""
+        return np.concatenate(list(self._ranks(restricoes, tamanho_lote)))
+
+    def contar(self, restricoes, tamanho_lote=4_000_000):
+        return int(sum(len(r) for r in self._ranks(restricoes, tamanho_lote)))
+
+    def consultar(self, restricoes, tamanho_lote=4_000_000):
+        """Todas as combinações (array M×5) que satisfazem as restrições."""
+        return desranquear(self.ranks(restricoes, tamanho_lote), 5)
+
+    def amostrar(self, restricoes, quantidade, rng=None, tamanho_lote=4_000_000):
+        """Amostra uniforme, sem reposição, das combinações que satisfazem as restrições.
+
+        Duas passadas pela tabela: a primeira só conta as combinações aceitas em cada lote;
+        a segunda sorteia de cada lote a sua parte (hipergeométrica multivariada, o que
+        mantém a amostra uniforme). A memória depende de `quantidade` e do lote, não de
+        quantas combinações são aceitas.
+        """
+        rng = np.random.default_rng(rng)
+        contagens = np.array([len(r) for r in self._ranks(restricoes, tamanho_lote)], dtype=np.int64)
+        quantidade = min(quantidade, int(contagens.sum()))
+        if not quantidade:
+            return np.empty((0, 5), dtype=np.int64)
+
+        por_lote = rng.multivariate_hypergeometric(contagens, quantidade)
+        escolhidos = [
+            np.sort(rng.choice(ranks, size=qtd, replace=False))
+            for ranks, qtd in zip(self._ranks(restricoes, tamanho_lote), por_lote) if qtd
+        ]
+        return desranquear(np.concatenate(escolhidos), 5)
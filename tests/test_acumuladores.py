@@ -0,0 +1,27 @@
+import numpy as np
+
+from acumuladores import AcumuladorEstatisticas
+from matriz_sorteios import MatrizSorteios
+
+def historico(primeiro, quantidade):
+    dezenas = np.array([[1, 2, 3, 4, 5]] * quantidade) + np.arange(quantidade)[:, None] % 70
+    datas = np.array(['01/01/2000'] * quantidade, dtype=object)
+    return MatrizSorteios(dezenas, np.arange(primeiro, primeiro + quantidade), datas)
+
+def test_sorteio_sem_numero_nao_altera_ultimo_concurso():
+    acumulador = AcumuladorEstatisticas()
+    acumulador.adicionar(historico(100, 10))
+    acumulador.adicionar([7, 21, 38, 52, 69])
+    assert acumulador.ultimo_concurso == 109
+    assert acumulador.total == 11
+
+def test_remover_atualiza_ultimo_concurso():
+    acumulador = AcumuladorEstatisticas()
+    matriz = historico(100, 10)
+    acumulador.adicionar(matriz)
+    acumulador.remover(matriz[:3])  # janela deslizando: o último continua
+    assert acumulador.ultimo_concurso == 109
+    acumulador.remover(matriz[-2:])
+    assert acumulador.ultimo_concurso == 107
+    acumulador.remover(matriz[3:8])
+    assert acumulador.ultimo_concurso == 0
@@ -0,0 +1,14 @@
+import numpy as np
+
+from cobertura import otimizar_cobertura
+
+def test_orcamento_zero_devolve_array_vazio():
+    cartoes = otimizar_cobertura(range(1, 41), 0)
+    assert cartoes.shape == (0, 5)
+
+def test_cartoes_distintos_do_pool():
+    pool = list(range(1, 21))
+    cartoes = otimizar_cobertura(pool, 10, rng=0)
+    assert cartoes.shape == (10, 5)
+    assert np.isin(cartoes, pool).all()
+    assert len(np.unique(cartoes, axis=0)) == 10
@@ -0,0 +1,67 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from coleta_dados import baixar_concursos, obter_ultimo_concurso
+from controle_taxa import ControladorTaxa
+
+INEXISTENTE = 13
+ULTIMO = 20
+
+class ApiFalsa(BaseHTTPRequestHandler):
+    """Imita /api/quina/{n}; os concursos pares demoram mais, para as respostas chegarem fora de ordem."""
+
+    def do_GET(self):
+        numero = self.path.rstrip('/').rsplit('/', 1)[-1]
+        numero = ULTIMO if numero == 'latest' else int(numero)
+        if numero == INEXISTENTE or numero > ULTIMO:
+            self.send_error(404)
+            return
+        time.sleep(0.02 if numero % 2 == 0 else 0)
+        corpo = json.dumps({
+            'numero': numero,
+            'dataApuracao': f'{numero:02d}/01/2024',
+            'listaDezenas': [f'{(numero + i) % 80 + 1:02d}' for i in range(0, 50, 10)],
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def base_url():
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ApiFalsa)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{servidor.server_address[1]}/api/quina/{{}}'
+    servidor.shutdown()
+    servidor.server_close()
+
+@pytest.fixture
+def controlador():
+    return ControladorTaxa(taxa_inicial=1000, taxa_maxima=1000)
+
+def test_baixar_concursos_em_ordem_com_progresso_e_falhas_resumidas(base_url, controlador):
+    progresso, avisos = [], []
+    concursos = baixar_concursos(
+        range(1, ULTIMO + 1), max_workers=4, base_url=base_url, controlador=controlador,
+        ao_progredir=lambda feitos, total: progresso.append((feitos, total)), avisos=avisos,
+    )
+
+    assert [c['concurso'] for c in concursos] == [n for n in range(1, ULTIMO + 1) if n != INEXISTENTE]
+    assert concursos[0] == {'concurso': 1, 'data': '01/01/2024', 'dezenas': [2, 12, 22, 32, 42]}
+    assert progresso[-1] == (ULTIMO, ULTIMO)
+    # O 404 não é repetido e aparece uma única vez, numa única mensagem
+    assert len(avisos) == 1
+    assert 'HTTP 404' in avisos[0] and avisos[0].endswith(f': {INEXISTENTE}.')
+    assert controlador.contagem['falhas'] == 1
+
+def test_obter_ultimo_concurso(base_url, controlador):
+    assert obter_ultimo_concurso(base_url=base_url, controlador=controlador) == ULTIMO
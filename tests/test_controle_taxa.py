@@ -0,0 +1,86 @@
+import pytest
+
+from controle_taxa import CircuitoAberto, ControladorTaxa
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+        self.esperas = 0
+
+    def __call__(self):
+        return self.agora
+
+    def dormir(self, segundos):
+        self.esperas += 1
+        if self.esperas > 10_000:
+            raise AssertionError("adquirir() não retornou")
+        # Como o time.sleep real, toda espera avança o relógio um pouco
+        self.agora += max(segundos, 1e-6)
+
+@pytest.fixture
+def controlador():
+    relogio = RelogioFalso()
+    return ControladorTaxa(falhas_para_abrir=5, pausa_circuito=15.0, relogio=relogio, dormir=relogio.dormir)
+
+def abrir_e_sondar(controlador):
+    for _ in range(5):
+        controlador.adquirir()
+        controlador.registrar_falha(503)
+    assert controlador.estado == 'aberto'
+    controlador.adquirir()  # espera a pausa e sai como sondagem
+    assert controlador.estado == 'meio-aberto'
+
+def test_sondagem_com_sucesso_fecha_o_disjuntor(controlador):
+    abrir_e_sondar(controlador)
+    controlador.registrar_sucesso(0.1)
+    assert controlador.estado == 'fechado'
+    controlador.adquirir()
+
+def test_sondagem_com_erro_do_cliente_libera_nova_sondagem(controlador):
+    abrir_e_sondar(controlador)
+    controlador.registrar_falha(404)
+    # Um 4xx não diz nada sobre a API: continua meio-aberto, e a próxima requisição sonda
+    assert controlador.estado == 'meio-aberto'
+    assert controlador.contagem['aberturas'] == 1
+    controlador.adquirir()
+    controlador.registrar_falha(200)  # JSON inválido
+    controlador.adquirir()
+    controlador.registrar_sucesso(0.1)
+    assert controlador.estado == 'fechado'
+
+def test_sondagem_com_falha_da_api_reabre(controlador):
+    abrir_e_sondar(controlador)
+    controlador.registrar_falha(503)
+    assert controlador.estado == 'aberto'
+    assert controlador.contagem['aberturas'] == 2
+
+def test_rajada_de_falhas_concorrentes_abre_o_disjuntor_uma_vez(controlador):
+    # 8 requisições em voo ao mesmo tempo (MAX_CONEXOES) e todas falham
+    for _ in range(8):
+        controlador.adquirir()
+    for _ in range(8):
+        controlador.registrar_falha(503)
+    assert controlador.contagem['aberturas'] == 1
+    assert controlador.contagem['falhas'] == 8
+    assert controlador.estado == 'aberto'
+
+    controlador.adquirir()  # espera a pausa em vez de desistir com CircuitoAberto
+    assert controlador.estado == 'meio-aberto'
+    controlador.registrar_sucesso(0.1)
+    assert controlador.estado == 'fechado'
+
+def test_falha_atrasada_com_disjuntor_aberto_so_conta(controlador):
+    abrir_e_sondar(controlador)
+    controlador.registrar_falha(503)  # a sondagem falha: reabre
+    controlador.registrar_falha(503)  # resposta atrasada de antes: só conta
+    assert controlador.contagem['aberturas'] == 2
+    assert controlador.contagem['falhas'] == 7
+
+def test_sondagens_que_falham_seguidas_desistem(controlador):
+    abrir_e_sondar(controlador)
+    controlador.registrar_falha(None)
+    controlador.adquirir()
+    controlador.registrar_falha(None)
+    assert controlador.contagem['aberturas'] == 3
+    with pytest.raises(CircuitoAberto):
+        controlador.adquirir()
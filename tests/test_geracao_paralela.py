@@ -0,0 +1,17 @@
+import numpy as np
+
+from geracao_paralela import gerar_cartoes, gravar_cartoes, ler_cartoes
+
+def test_mesma_semente_mesmos_cartoes_com_qualquer_numero_de_processos(tmp_path):
+    # Tarefas pequenas para que a geração passe por várias tarefas e rodadas
+    um = gerar_cartoes(5000, semente=42, processos=1, cartoes_por_tarefa=1000)
+    varios = gerar_cartoes(5000, semente=42, processos=3, cartoes_por_tarefa=1000)
+    np.testing.assert_array_equal(um, varios)
+    assert len(np.unique(um, axis=0)) == len(um)
+    assert (np.diff(um, axis=1) > 0).all()
+
+def test_gravar_e_ler_da_os_mesmos_cartoes_que_gerar(tmp_path):
+    caminho = tmp_path / 'cartoes.npy'
+    gravar_cartoes(caminho, 1000, semente=42, processos=2)
+    np.testing.assert_array_equal(ler_cartoes(caminho), gerar_cartoes(1000, semente=42))
+    np.testing.assert_array_equal(ler_cartoes(caminho, 10, 20), gerar_cartoes(1000, semente=42)[10:20])
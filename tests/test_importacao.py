@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pytest
+
+from armazenamento import abrir_banco, carregar_concursos
+from importacao import importar_resultados, ler_resultados
+
+EXEMPLO = Path(__file__).resolve().parent.parent / 'dados' / 'exemplo_resultados.htm'
+
+def escrever_csv(pasta, *linhas):
+    caminho = pasta / 'resultados.csv'
+    caminho.write_text("Concurso;Data Sorteio;Bola1;Bola2;Bola3;Bola4;Bola5\n" + "\n".join(linhas) + "\n",
+                       encoding='utf-8')
+    return caminho
+
+def test_importa_o_arquivo_de_exemplo():
+    conexao = abrir_banco(':memory:')
+    resultado = importar_resultados(conexao, EXEMPLO, tamanho_lote=7)
+    assert resultado == {'importados': 40, 'primeiro': 1, 'ultimo': 40, 'lacunas': []}
+
+    df = carregar_concursos(conexao)
+    assert len(df) == 40
+    # Concurso com ganhadores ocupa duas linhas no HTML (cidades): entra uma vez só
+    primeiro = df.iloc[0]
+    assert list(primeiro['dezenas']) == [24, 26, 39, 61, 75]
+    assert primeiro['data'] == '02/01/2024'
+
+def test_importacao_aponta_lacunas(tmp_path):
+    caminho = escrever_csv(tmp_path, "1;01/01/2024;1;2;3;4;5", "4;04/01/2024;6;7;8;9;10")
+    resultado = importar_resultados(abrir_banco(':memory:'), caminho)
+    assert resultado == {'importados': 2, 'primeiro': 1, 'ultimo': 4, 'lacunas': [2, 3]}
+
+@pytest.mark.parametrize('linhas', [
+    ("1;01/01/2024;1;2;3;4;81",),
+    ("1;01/01/2024;0;2;3;4;5",),
+    ("1;01/01/2024;1;2;3;4;4",),
+    ("2;02/01/2024;1;2;3;4;5", "1;01/01/2024;6;7;8;9;10"),
+    ("1;01/01/2024;1;2;3;4;5", "1;01/01/2024;6;7;8;9;10"),
+])
+def test_dezenas_invalidas_ou_concursos_fora_de_ordem(tmp_path, linhas):
+    with pytest.raises(ValueError):
+        list(ler_resultados(escrever_csv(tmp_path, *linhas)))
@@ -0,0 +1,23 @@
+import threading
+
+from instrumentacao import INSTRUMENTACAO, Instrumentacao, etapa, usar
+
+def test_coletores_de_execucoes_diferentes_nao_se_misturam():
+    resultados = {}
+
+    def execucao(nome, ligar):
+        usar(Instrumentacao() if ligar else None)
+        if ligar:
+            INSTRUMENTACAO.ativar()
+        with etapa(nome):
+            pass
+        resultados[nome] = set(INSTRUMENTACAO.resumo()['etapas'])
+
+    threads = [threading.Thread(target=execucao, args=args) for args in [('a', True), ('b', False), ('c', True)]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert resultados == {'a': {'a'}, 'b': set(), 'c': {'c'}}
+    assert not INSTRUMENTACAO.ativa
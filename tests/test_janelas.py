@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from janelas import JanelasFrequencia
+from matriz_sorteios import MatrizSorteios
+
+@pytest.fixture
+def janelas():
+    rng = np.random.default_rng(0)
+    dezenas = np.sort(np.array([rng.choice(80, 5, replace=False) + 1 for _ in range(100)]), axis=1)
+    return JanelasFrequencia(MatrizSorteios(dezenas, np.arange(1, 101), np.array(['01/01/2024'] * 100, dtype=object)))
+
+@pytest.mark.parametrize('inicio, fim', [
+    (None, None), (10, 40), (-30, None), (None, -20), (-150, -20), (None, -150), (-150, -120),
+    (-10, -20), (60, 40), (90, 500), (-5, 200), (150, None), (None, 0), (0, -100),
+])
+def test_frequencia_igual_ao_fatiamento(janelas, inicio, fim):
+    esperado = janelas.matriz.incidencia[inicio:fim].sum(axis=0)
+    np.testing.assert_array_equal(janelas.frequencia(inicio, fim), esperado)
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from padroes_ocultos import COLUNAS_COLUNAS, COLUNAS_LINHAS, analisar_padroes_ocultos, extrair_caracteristicas
+
+# Fora de ordem e nas fronteiras das faixas (26/27, 53/54), das linhas (10/11) e em 80
+DEZENAS = [[27, 10, 53, 11, 26], [80, 54, 1, 20, 21]]
+
+# Calculado à mão, com as mesmas regras da implementação original linha a linha
+ESPERADO = [
+    {'faixa_baixa': 3, 'faixa_media': 2, 'faixa_alta': 0,
+     'colunas': {0: 1, 1: 1, 3: 1, 6: 1, 7: 1}, 'linhas': {1: 1, 2: 1, 3: 2, 6: 1},
+     'distancias': [1, 15, 1, 26], 'amplitude': 43, 'min': 10, 'max': 53, 'media': 25.4, 'sequencias': 2},
+    {'faixa_baixa': 3, 'faixa_media': 0, 'faixa_alta': 2,
+     'colunas': {0: 2, 1: 2, 4: 1}, 'linhas': {1: 1, 2: 1, 3: 1, 6: 1, 8: 1},
+     'distancias': [19, 1, 33, 26], 'amplitude': 79, 'min': 1, 'max': 80, 'media': 35.2, 'sequencias': 1},
+]
+
+def test_colunas_iguais_as_calculadas_a_mao():
+    df = pd.DataFrame({'concurso': [1, 2], 'data': ['01/01/2024', '02/01/2024'], 'dezenas': DEZENAS})
+    resultado = analisar_padroes_ocultos(df)
+
+    assert list(resultado['dezenas']) == DEZENAS  # a coluna original não é alterada
+    for (_, linha), esperado in zip(resultado.iterrows(), ESPERADO):
+        for nome in ('faixa_baixa', 'faixa_media', 'faixa_alta', 'amplitude', 'min', 'max', 'sequencias'):
+            assert linha[nome] == esperado[nome], nome
+        assert linha['media'] == esperado['media']
+        assert linha['distancias'] == esperado['distancias']
+        assert [linha[c] for c in COLUNAS_COLUNAS] == [esperado['colunas'].get(i, 0) for i in range(10)]
+        assert [linha[c] for c in COLUNAS_LINHAS] == [esperado['linhas'].get(i, 0) for i in range(1, 9)]
+
+def test_array_fora_de_ordem_igual_ao_dataframe():
+    caracteristicas = extrair_caracteristicas(np.array(DEZENAS))
+    assert caracteristicas['amplitude'].tolist() == [e['amplitude'] for e in ESPERADO]
+    assert caracteristicas['distancias'].tolist() == [e['distancias'] for e in ESPERADO]
+    assert caracteristicas['faixa_media'].tolist() == [e['faixa_media'] for e in ESPERADO]
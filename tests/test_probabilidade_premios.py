@@ -0,0 +1,28 @@
+import numpy as np
+
+from combinatoria import desranquear
+from conferencia import FAIXAS_PREMIO, matriz_acertos
+from probabilidade_premios import TOTAL_RESULTADOS, distribuicao_premios, resumo_premios
+
+CARTOES = np.array([[1, 2, 3, 4, 5], [3, 4, 5, 6, 7], [10, 20, 30, 40, 50], [5, 17, 33, 61, 80]])
+
+def test_distribuicao_igual_a_conferir_todos_os_resultados():
+    melhor = np.zeros(6, dtype=np.int64)
+    por_faixa = np.zeros((len(FAIXAS_PREMIO), len(CARTOES) + 1), dtype=np.int64)
+    for inicio in range(0, TOTAL_RESULTADOS, 2_000_000):
+        sorteios = desranquear(np.arange(inicio, min(inicio + 2_000_000, TOTAL_RESULTADOS)), 5)
+        acertos = matriz_acertos(CARTOES, sorteios)
+        melhor += np.bincount(acertos.max(axis=0), minlength=6)
+        for i, qtd in enumerate(FAIXAS_PREMIO):
+            por_faixa[i] += np.bincount((acertos == qtd).sum(axis=0), minlength=len(CARTOES) + 1)
+
+    distribuicao = distribuicao_premios(CARTOES, processos=1)
+    assert distribuicao['total'] == TOTAL_RESULTADOS
+    np.testing.assert_array_equal(distribuicao['melhor_acerto'], melhor)
+    np.testing.assert_array_equal(distribuicao['cartoes_por_faixa'], por_faixa)
+
+def test_um_cartao_tem_as_probabilidades_conhecidas():
+    resumo = resumo_premios(distribuicao_premios(CARTOES[:1], processos=1)).set_index('faixa')
+    assert resumo.loc['quina', 'chance_1_em'] == TOTAL_RESULTADOS
+    # Quadra: 5 escolhas das dezenas acertadas × 75 dezenas de fora
+    assert resumo.loc['quadra', 'prob_algum_cartão'] == 5 * 75 / TOTAL_RESULTADOS
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+import servico_dados
+from armazenamento import abrir_banco, salvar_concursos
+from servico_dados import ServicoDados
+
+THREADS = 20
+
+def concurso(numero):
+    return {'concurso': numero, 'data': '01/01/2024', 'dezenas': [(numero + i) % 80 + 1 for i in range(0, 50, 10)]}
+
+class ApiFalsa:
+    """Substitui a coleta: conta as cargas e pode segurá-las até o teste liberar."""
+
+    def __init__(self, caminho_banco, ultimo):
+        self.caminho_banco = caminho_banco
+        self.ultimo = ultimo
+        self.cargas = 0
+        self.em_carga = threading.Event()
+        self.liberar = threading.Event()
+        self.liberar.set()
+
+    def obter_ultimo_concurso(self):
+        return self.ultimo
+
+    def sincronizar_banco(self, conexao, ultimo, desde=None, ao_progredir=None):
+        self.cargas += 1
+        self.em_carga.set()
+        self.liberar.wait(5)
+        time.sleep(0.05)  # dá tempo das outras threads chegarem durante a carga
+        return salvar_concursos(conexao, [concurso(n) for n in range(desde, ultimo + 1)])
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    caminho = tmp_path / 'quina.sqlite3'
+    abrir_banco(caminho).close()
+    falsa = ApiFalsa(caminho, ultimo=100)
+    monkeypatch.setattr(servico_dados, 'obter_ultimo_concurso', falsa.obter_ultimo_concurso)
+    monkeypatch.setattr(servico_dados, 'sincronizar_banco', falsa.sincronizar_banco)
+    monkeypatch.setattr(servico_dados, 'preencher_com_arquivo', lambda *args, **kwargs: 0)
+    return falsa
+
+def em_paralelo(funcao):
+    barreira = threading.Barrier(THREADS)
+    resultados = [None] * THREADS
+
+    def executar(i):
+        barreira.wait()
+        resultados[i] = funcao()
+
+    threads = [threading.Thread(target=executar, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return resultados
+
+def test_carga_unica_e_mesmo_objeto_para_todos(api):
+    servico = ServicoDados(caminho_banco=api.caminho_banco)
+    matrizes = em_paralelo(lambda: servico.concursos(50))
+
+    assert api.cargas == 1
+    assert all(matriz is matrizes[0] for matriz in matrizes)
+    assert list(matrizes[0].concursos) == list(range(51, 101))
+    assert not matrizes[0].dezenas.flags.writeable
+
+def test_derivado_calculado_uma_vez(api):
+    servico = ServicoDados(caminho_banco=api.caminho_banco)
+    matriz = servico.concursos(50)
+    calculos = []
+
+    def calcular(m):
+        calculos.append(1)
+        time.sleep(0.05)
+        return {'total': len(m)}
+
+    resultados = em_paralelo(lambda: servico.derivado(matriz, 'total', calcular))
+    assert len(calculos) == 1
+    assert all(resultado is resultados[0] for resultado in resultados)
+    assert servico.derivado(matriz, 'total', calcular) is resultados[0]
+    assert len(calculos) == 1
+
+def test_dados_vencidos_servidos_durante_a_atualizacao(api):
+    servico = ServicoDados(caminho_banco=api.caminho_banco)
+    antiga = servico.concursos(50)
+
+    api.ultimo = 101
+    api.em_carga.clear()
+    api.liberar.clear()
+    servico.invalidar()
+    atualizadora = threading.Thread(target=servico.concursos, args=(50,))
+    atualizadora.start()
+    assert api.em_carga.wait(5)
+
+    # Enquanto uma sessão recarrega, as demais recebem a versão anterior sem esperar
+    leituras = em_paralelo(lambda: servico.concursos(50))
+    assert all(matriz is antiga for matriz in leituras)
+    assert api.cargas == 2
+
+    api.liberar.set()
+    atualizadora.join()
+    nova = servico.concursos(50)
+    assert nova is not antiga
+    assert nova.concursos[-1] == 101
+    assert api.cargas == 2
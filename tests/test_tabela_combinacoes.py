@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from combinatoria import ranquear
+from tabela_combinacoes import TOTAL, TabelaCombinacoes
+
+@pytest.fixture(scope='module')
+def tabela():
+    # Coluna sintética em memória no lugar da tabela gravada (24 milhões de linhas)
+    tabela = TabelaCombinacoes.__new__(TabelaCombinacoes)
+    tabela._colunas = {'soma': (np.arange(TOTAL) % 1000).astype(np.uint16)}
+    return tabela
+
+def test_amostra_distinta_e_dentro_das_restricoes(tabela):
+    restricoes = {'soma': (10, 12)}
+    amostra = tabela.amostrar(restricoes, 5000, rng=0, tamanho_lote=1_000_000)
+    ranks = ranquear(amostra)
+    assert len(amostra) == 5000
+    assert len(np.unique(ranks)) == 5000
+    assert np.isin(ranks % 1000, [10, 11, 12]).all()
+    assert (np.diff(ranks) > 0).all()
+    # Uniforme entre os lotes: cada lote de 1 milhão tem ~1/24 das aceitas
+    por_lote = np.bincount(ranks // 1_000_000, minlength=25)
+    assert por_lote[:24].min() > 120 and por_lote[:24].max() < 300
+
+def test_amostra_limitada_ao_total_aceito(tabela):
+    restricoes = {'soma': 999}
+    total = tabela.contar(restricoes)
+    amostra = tabela.amostrar(restricoes, total + 10, rng=1)
+    np.testing.assert_array_equal(np.sort(ranquear(amostra)), tabela.ranks(restricoes))
+
+def test_sem_combinacoes_aceitas(tabela):
+    assert tabela.amostrar({'soma': 5000}, 10).shape == (0, 5)
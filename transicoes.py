@@ -0,0 +1,82 @@
+"""Matrizes de transição entre sorteios: quantas vezes a dezena j saiu `k` concursos depois
+de um sorteio com a dezena i, para várias defasagens k.
+
+Com X a incidência N×80, a contagem da defasagem k é o produto X[:-k]ᵀ · X[k:]. Novos
+sorteios só acrescentam os produtos das linhas novas com as `k` anteriores, então a
+atualização custa proporcional ao que chegou, não ao histórico.
+"""
+import numpy as np
+import pandas as pd
+
+from matriz_sorteios import DEZENAS_POR_SORTEIO, TOTAL_DEZENAS, como_matriz
+
+DEFASAGENS_PADRAO = (1, 2, 3, 4, 5)
+
+class MatrizTransicoes:
+    def __init__(self, dados=None, defasagens=(1,)):
+        self.defasagens = tuple(sorted(set(int(k) for k in defasagens)))
+        if not self.defasagens or self.defasagens[0] < 1:
+            raise ValueError("As defasagens devem ser inteiros >= 1")
+        self.contagens = {k: np.zeros((TOTAL_DEZENAS, TOTAL_DEZENAS), dtype=np.int64) for k in self.defasagens}
+        # Vezes em que cada dezena saiu num sorteio que já tem um sucessor k concursos à frente
+        self.origens = {k: np.zeros(TOTAL_DEZENAS, dtype=np.int64) for k in self.defasagens}
+        self.total_sorteios = 0
+        # Últimas linhas de incidência: as únicas necessárias para emparelhar sorteios futuros
+        self._cauda = np.zeros((0, TOTAL_DEZENAS), dtype=np.float64)
+        if dados is not None:
+            self.adicionar(dados)
+
+    def adicionar(self, dados):
+        """Acrescenta sorteios posteriores aos já processados (em ordem cronológica)."""
+        novos = como_matriz(dados).incidencia.astype(np.float64)
+        if not len(novos):
+            return self
+        incidencia = np.concatenate([self._cauda, novos])
+        inicio_novos = len(self._cauda)
+        for k in self.defasagens:
+            # Pares (s, s + k) cujo destino é um sorteio novo
+            primeiro, ultimo = max(0, inicio_novos - k), len(incidencia) - k
+            if ultimo > primeiro:
+                origem, destino = incidencia[primeiro:ultimo], incidencia[primeiro + k:]
+                self.contagens[k] += np.rint(origem.T @ destino).astype(np.int64)
+                self.origens[k] += origem.sum(axis=0).astype(np.int64)
+        self.total_sorteios += len(novos)
+        self._cauda = incidencia[-self.defasagens[-1]:]
+        return self
+
+    def condicional(self, k=1):
+        """Matriz 80×80 com P(dezena j em t + k | dezena i em t) (linha i, coluna j)."""
+        origens = self.origens[k][:, None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(origens > 0, self.contagens[k] / origens, 0.0)
+
+    def proximas(self, sorteio=None, k=1, top=10):
+        """Dezenas mais prováveis `k` concursos depois de `sorteio` (padrão: o último processado).
+
+        A probabilidade de cada dezena é a média (ponderada pelas ocorrências) das
+        condicionais dadas as dezenas do sorteio; `razão` compara com a frequência base.
+        """
+        if sorteio is None:
+            if not len(self._cauda):
+                raise ValueError("Nenhum sorteio processado")
+            indices = np.flatnonzero(self._cauda[-1])
+        else:
+            indices = np.asarray(sorted(set(sorteio)), dtype=np.intp) - 1
+
+        contagens = self.contagens[k][indices].sum(axis=0)
+        origens = self.origens[k][indices].sum()
+        probabilidade = contagens / origens if origens else np.zeros(TOTAL_DEZENAS)
+        # Fração dos sorteios de destino (um por par da defasagem k) em que cada dezena saiu;
+        # cada destino aparece uma vez por dezena da origem, daí as divisões pelas 5 dezenas
+        total_pares = self.origens[k].sum() / DEZENAS_POR_SORTEIO
+        destinos = self.contagens[k].sum(axis=0) / DEZENAS_POR_SORTEIO
+        base = destinos / total_pares if total_pares else np.zeros(TOTAL_DEZENAS)
+
+        tabela = pd.DataFrame({
+            'dezena': np.arange(1, TOTAL_DEZENAS + 1),
+            'probabilidade': probabilidade,
+            'base': base,
+        })
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tabela['razão'] = np.where(base > 0, probabilidade / base, np.nan)
+        return tabela.sort_values(['probabilidade', 'dezena'], ascending=[False, True]).head(top).reset_index(drop=True)